@@ -0,0 +1,82 @@
+"""Compare time bucketing in components.aggregation with grouping on strftime strings.
+
+Run from the project root:
+
+    python -m benchmarks.aggregation [rows]
+
+Each bucket size is summed three ways over the same synthetic transactions:
+grouping on dt.strftime labels (the old approach), grouping on dt.to_period,
+and bucket_totals. The best of several runs is reported for each.
+"""
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from components.aggregation import bucket_totals
+
+DEFAULT_ROWS = 1_000_000
+REPEAT = 5
+
+STRFTIME_FORMATS = {
+    'day': '%Y-%m-%d',
+    'week': '%G-W%V',
+    'month': '%Y-%m',
+    'year': '%Y',
+}
+
+PERIOD_FREQUENCIES = {
+    'day': 'D',
+    'week': 'W',
+    'month': 'M',
+    'quarter': 'Q',
+    'year': 'Y',
+}
+
+
+def make_frame(rows, seed=0):
+    """Transactions spread over ten years with timestamps down to the second"""
+    rng = np.random.default_rng(seed)
+    seconds = rng.integers(0, 10 * 365 * 86400, rows)
+    return pd.DataFrame({
+        'date': pd.Timestamp('2015-01-01') + pd.to_timedelta(seconds, unit='s'),
+        'amount': rng.gamma(2.0, 50.0, rows).round(2),
+    })
+
+
+def best_time(func):
+    return min(timeit.repeat(func, number=1, repeat=REPEAT))
+
+
+def run(rows=DEFAULT_ROWS):
+    """Return a list of (bucket, method, seconds) timings"""
+    df = make_frame(rows)
+    results = []
+    for freq, period in PERIOD_FREQUENCIES.items():
+        if freq in STRFTIME_FORMATS:
+            fmt = STRFTIME_FORMATS[freq]
+            results.append((freq, 'strftime groupby', best_time(
+                lambda: df.groupby(df['date'].dt.strftime(fmt))['amount'].sum())))
+        results.append((freq, 'to_period groupby', best_time(
+            lambda: df.groupby(df['date'].dt.to_period(period))['amount'].sum())))
+        results.append((freq, 'bucket_totals', best_time(
+            lambda: bucket_totals(df['date'], df['amount'], freq))))
+    return results
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    results = run(rows)
+    print(f"{rows:,} rows, best of {REPEAT}")
+    print(f"{'bucket':<9}{'method':<20}{'seconds':>10}{'speedup':>10}")
+    for freq in PERIOD_FREQUENCIES:
+        timings = [(method, seconds) for bucket, method, seconds in results if bucket == freq]
+        baseline = timings[0][1]
+        for method, seconds in timings:
+            print(f"{freq:<9}{method:<20}{seconds:>10.4f}{baseline / seconds:>9.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
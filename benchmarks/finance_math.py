@@ -0,0 +1,80 @@
+"""Compare the savings calculator's month-by-month loop with components.finance_math.
+
+Run from the project root:
+
+    python -m benchmarks.finance_math
+
+Times a 600-month balance timeline built the old way (a Python loop
+appending dicts) and with balance_timeline, and a grid of (rate, horizon)
+scenarios solved one at a time with the scalar closed form and with one
+payment_grid call. The best of several runs is reported for each.
+"""
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from components.finance_math import balance_timeline, payment_grid
+
+REPEAT = 5
+MONTHS = 600
+RATES = np.linspace(0.0, 0.15, 100)
+YEARS = np.arange(1, 51)
+
+
+def loop_timeline(monthly_rate, months, current_savings, monthly_savings):
+    """The calculator's original timeline loop"""
+    timeline = []
+    balance = current_savings
+    for month in range(months + 1):
+        timeline.append({'Month': month, 'Balance': round(balance, 2)})
+        balance = balance + balance * monthly_rate + monthly_savings
+    return pd.DataFrame(timeline)
+
+
+def vector_timeline(monthly_rate, months, current_savings, monthly_savings):
+    balances = balance_timeline(monthly_rate, months, current_savings, monthly_savings)
+    return pd.DataFrame({'Month': np.arange(months + 1), 'Balance': balances.round(2)})
+
+
+def scalar_payment(monthly_rate, months, current_savings, target):
+    """Closed-form payment for one scenario, as np.pmt computed it"""
+    if monthly_rate == 0:
+        return (target - current_savings) / months
+    growth = (1 + monthly_rate) ** months
+    return (target - current_savings * growth) * monthly_rate / (growth - 1)
+
+
+def best_time(func):
+    return min(timeit.repeat(func, number=1, repeat=REPEAT))
+
+
+def run():
+    """Return a list of (case, method, seconds) timings"""
+    rate = 0.05 / 12
+    results = [
+        (f'{MONTHS}-month timeline', 'python loop', best_time(lambda: loop_timeline(rate, MONTHS, 5000, 500))),
+        (f'{MONTHS}-month timeline', 'balance_timeline', best_time(lambda: vector_timeline(rate, MONTHS, 5000, 500))),
+    ]
+    grid_case = f'{len(RATES) * len(YEARS):,} scenarios'
+    results.append((grid_case, 'python loop', best_time(
+        lambda: [[scalar_payment(r / 12, int(y * 12), 5000, 1_000_000) for y in YEARS] for r in RATES])))
+    results.append((grid_case, 'payment_grid', best_time(lambda: payment_grid(RATES, YEARS, 5000, 1_000_000))))
+    return results
+
+
+def main():
+    results = run()
+    print(f"best of {REPEAT}")
+    print(f"{'case':<22}{'method':<22}{'seconds':>10}{'speedup':>10}")
+    for case in dict.fromkeys(case for case, _, _ in results):
+        timings = [(method, seconds) for name, method, seconds in results if name == case]
+        baseline = timings[0][1]
+        for method, seconds in timings:
+            print(f"{case:<22}{method:<22}{seconds:>10.5f}{baseline / seconds:>9.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
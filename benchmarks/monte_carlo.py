@@ -0,0 +1,62 @@
+"""Measure Monte Carlo savings projection throughput in paths per second.
+
+Run from the project root:
+
+    python -m benchmarks.monte_carlo --months 360 --workers 4
+
+Each path count is simulated in this process (workers=1) and across the
+process pool, with the size threshold lifted so every count uses the pool.
+The pool is started once before timing, as the app keeps it between runs.
+Both runs share a seed and must produce identical percentile bands.
+"""
+import argparse
+import sys
+import timeit
+
+from components import monte_carlo
+from components.monte_carlo import default_workers, simulate_savings
+
+PATH_COUNTS = [1_000, 10_000, 50_000, 100_000]
+
+
+def simulate(paths, months, workers, seed):
+    return simulate_savings(500_000, 10_000, 800, months, mean_return=0.07, volatility=0.15, inflation=0.02,
+                            contribution_growth=0.03, paths=paths, seed=seed, workers=workers)
+
+
+def run(path_counts=PATH_COUNTS, months=360, workers=None, repeat=3, seed=0):
+    """Return a list of (paths, method, seconds, identical) timings"""
+    workers = workers or default_workers()
+    monte_carlo.PARALLEL_MIN_PATH_MONTHS = 0
+    # Start the pool's processes outside the timings
+    simulate(monte_carlo.CHUNK_PATHS * workers, 12, workers, seed)
+    results = []
+    for paths in path_counts:
+        serial = simulate(paths, months, 1, seed)
+        pooled = simulate(paths, months, workers, seed)
+        identical = serial['bands'].equals(pooled['bands']) and serial['probability'] == pooled['probability']
+        for method, count in (('serial', 1), (f'pool x{workers}', workers)):
+            seconds = min(timeit.repeat(lambda: simulate(paths, months, count, seed), number=1, repeat=repeat))
+            results.append((paths, method, seconds, identical))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--paths', type=int, nargs='+', default=PATH_COUNTS)
+    parser.add_argument('--months', type=int, default=360)
+    parser.add_argument('--workers', type=int, help=f'pool size (default: usable CPUs, {default_workers()} here)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    results = run(args.paths, args.months, args.workers, args.repeat, args.seed)
+    print(f"{args.months} months, best of {args.repeat}")
+    print(f"{'paths':>10}  {'method':<12}{'seconds':>10}{'paths/s':>14}{'same result':>13}")
+    for paths, method, seconds, identical in results:
+        print(f"{paths:>10,}  {method:<12}{seconds:>10.4f}{paths / seconds:>14,.0f}{'yes' if identical else 'NO':>13}")
+    return 0 if all(identical for *_, identical in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""Render every sidebar page of main.py through AppTest on seeded databases of several sizes.
+
+Run from the project root:
+
+    python -m benchmarks.pages --sizes 0 10000 100000 --output page_results.json
+
+Size 0 is a fresh, empty database; other sizes are filled by
+benchmarks.synthetic with data ending today, so date-windowed views such as
+"last 30 days" have rows in them. For each page a new session is started with
+the cached Database cleared, and three numbers are recorded:
+
+- first: the run that first renders the page. For Dashboard this is the
+  session's opening run, which also opens the database; other pages are
+  reached from the Dashboard.
+- rerun: best rerun of the same page, the cost of any widget interaction.
+- peak: the most memory Python held during the first render, traced with
+  tracemalloc in a second fresh session so tracing does not slow the timed
+  runs.
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from database import Database
+from benchmarks.suite import environment
+from benchmarks.synthetic import SyntheticConfig, populate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ["Dashboard", "Transactions", "Budget", "Reports", "Settings", "Savings Calculator", "Data Operations"]
+DEFAULT_SIZES = [0, 10_000, 100_000]
+
+
+def seeded_database(size, seed, data_dir):
+    """Path of the database for a size, generating it on first use"""
+    end = pd.Timestamp.today().normalize()
+    path = os.path.join(data_dir, f"pages_{size}_{seed}_{end:%Y%m%d}.db")
+    if not os.path.exists(path):
+        db = Database(path)
+        if size:
+            populate(db, SyntheticConfig.for_rows(size, seed=seed, end_date=end.strftime('%Y-%m-%d')))
+        db.close()
+    return path
+
+
+def open_page(page, timeout):
+    """Start a fresh session on page; returns the AppTest and the seconds its first render took"""
+    st.cache_resource.clear()
+    at = AppTest.from_file(os.path.join(ROOT, 'main.py'), default_timeout=timeout)
+    start = time.perf_counter()
+    at.run()
+    if page != PAGES[0]:
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        at.sidebar.radio[0].set_value(page).run()
+    return at, time.perf_counter() - start
+
+
+def render_page(page, repeat, timeout):
+    """Time one page in a fresh session and trace its memory in another; returns the result dict"""
+    at, first = open_page(page, timeout)
+    reruns = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        at.run()
+        reruns.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        open_page(page, timeout)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'page': page, 'first': first, 'rerun': min(reruns), 'reruns': reruns, 'peak_bytes': peak,
+        'exceptions': [str(e.value) for e in at.exception],
+    }
+
+
+def run(sizes, repeat=3, data_dir=None, seed=0, timeout=300, log=print):
+    """Render every page at every size and return the JSON-ready results dict"""
+    results = []
+    cwd = os.getcwd()
+    # main.py opens finance.db and .streamlit/style.css relative to the working directory
+    sys.path.insert(0, ROOT)
+    with tempfile.TemporaryDirectory() as tmp:
+        work = os.path.join(tmp, 'app')
+        shutil.copytree(os.path.join(ROOT, '.streamlit'), os.path.join(work, '.streamlit'))
+        try:
+            for size in sizes:
+                source = seeded_database(size, seed, data_dir or tmp)
+                # The app writes (recurring catch-up), so each size starts from a copy
+                shutil.copy(source, os.path.join(work, 'finance.db'))
+                os.chdir(work)
+                log(f"{size:,} target rows")
+                for page in PAGES:
+                    result = render_page(page, repeat, timeout)
+                    result['size'] = size
+                    results.append(result)
+                    error = f"  {len(result['exceptions'])} exception(s)" if result['exceptions'] else ''
+                    log(f"  {page:<20}{result['first'] * 1000:>10.0f} ms{result['rerun'] * 1000:>10.0f} ms"
+                        f"{result['peak_bytes'] / 2 ** 20:>9.1f} MB{error}")
+                os.chdir(cwd)
+                st.cache_resource.clear()
+                os.remove(os.path.join(work, 'finance.db'))
+        finally:
+            os.chdir(cwd)
+            sys.path.remove(ROOT)
+
+    return {'environment': environment(), 'repeat': repeat, 'seed': seed, 'results': results}
+
+
+def table(results):
+    """Pages down the side, sizes across, first/rerun milliseconds and peak MB in each cell"""
+    df = pd.DataFrame(results['results'])
+    df['cell'] = [
+        'error' if r.exceptions else f"{r.first * 1000:.0f} / {r.rerun * 1000:.0f} ms, {r.peak_bytes / 2 ** 20:.1f} MB"
+        for r in df.itertuples()
+    ]
+    grid = df.pivot(index='page', columns='size', values='cell').reindex(PAGES)
+    grid.columns = [f"{size:,} rows" for size in grid.columns]
+    return grid
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=300, help='seconds allowed for a single script run')
+    parser.add_argument('--data-dir', help='keep generated databases here and reuse them on later runs')
+    parser.add_argument('--output', help='also write the results as JSON')
+    args = parser.parse_args()
+    # Deprecation warnings from the pages would bury the table
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+
+    data_dir = os.path.abspath(args.data_dir) if args.data_dir else None
+    if data_dir:
+        os.makedirs(data_dir, exist_ok=True)
+    results = run(args.sizes, args.repeat, data_dir, args.seed, args.timeout)
+    print("\nfirst render / best rerun, peak Python memory during the first render")
+    print(table(results).to_string())
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {len(results['results'])} page timings to {args.output}")
+    return 1 if any(r['exceptions'] for r in results['results']) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
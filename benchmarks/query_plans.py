@@ -0,0 +1,143 @@
+"""Fail when a query issued by the app regresses to a full table scan.
+
+Run from the project root:
+
+    python -m benchmarks.query_plans
+
+Every read path the pages use is exercised against a throwaway database while
+the SQL it sends to SQLite is recorded. Each recorded SELECT is then run through
+EXPLAIN QUERY PLAN and any plain SCAN of a large table is reported.
+
+tests/test_query_plans.py runs the same check under pytest, and also checks
+the SQL traced while rendering every page of main.py with AppTest, so new
+queries are covered without being listed here.
+"""
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+from database import Database
+
+# Tables that grow with the transaction history and must never be scanned
+GUARDED_TABLES = {'transactions', 'transaction_tags'}
+
+SCAN_PATTERN = re.compile(r'^SCAN (\w+)')
+
+
+def seed(db):
+    """Insert a handful of rows so every code path issues its queries"""
+    today = datetime.now()
+    for days_ago, type_, category, amount, tags in [
+        (1, 'Income', 'Salary', 5000.0, ['work']),
+        (2, 'Expense', 'Food', 42.5, ['groceries']),
+        (40, 'Expense', 'Housing', 1200.0, []),
+        (400, 'Expense', 'Entertainment', 60.0, ['movies', 'friends']),
+    ]:
+        date = (today - timedelta(days=days_ago)).strftime('%Y-%m-%d')
+        db.add_transaction(date, type_, category, amount, f'{category} payment', tags)
+    db.set_budget_goal('Food', 300.0, 'monthly')
+    db.set_budget_goal('Housing', 1500.0, 'monthly')
+
+
+def scenarios(db):
+    """Database reads issued by the pages, as (name, callable, full_scan_ok)"""
+    today = datetime.now()
+    current_month = today.strftime('%Y-%m')
+    last_30 = today - timedelta(days=30)
+    budget_categories = db.get_budget_goals()['category'].tolist()
+
+    return [
+        ('get_transactions', db.get_transactions, True),
+        ('get_summary', db.get_summary, False),
+        ('get_transaction_date_range', db.get_transaction_date_range, False),
+        ('dashboard expense distribution', lambda: db.query_transactions(
+            start_date=last_30, end_date=today, types=['Expense'],
+            columns=['category', 'amount']), False),
+        ('dashboard popular tags', lambda: db.get_tag_counts(
+            limit=5, start_date=last_30, end_date=today, types=['Expense']), False),
+        ('search ranked', lambda: db.search_transactions('groc pay', types=['Expense']), False),
+        ('tag filter', lambda: db.query_transactions(tags=['groceries']), False),
+        ('transactions history', lambda: db.query_transactions(
+            start_date=last_30, end_date=today, columns=['date', 'type', 'category', 'amount',
+                                                         'description', 'tags'],
+            order_by='date', ascending=False), False),
+        ('transactions history compact', lambda: db.query_transactions(
+            start_date=last_30, end_date=today, columns=['id', 'date', 'type', 'category', 'amount',
+                                                         'description'],
+            order_by='date', ascending=False, compact=True), False),
+        ('history page', lambda: db.page_transactions(
+            50, columns=['id', 'date', 'type', 'category', 'amount', 'description'], compact=True,
+            start_date=last_30, end_date=today), False),
+        ('history next page', lambda: db.page_transactions(
+            50, after=(today, 10), start_date=last_30, end_date=today, types=['Expense']), False),
+        ('history previous page', lambda: db.page_transactions(
+            50, before=(last_30, 1), start_date=last_30, end_date=today), False),
+        ('history totals', lambda: [db.get_transaction_totals(by, start_date=last_30, end_date=today,
+                                                              search='pay')
+                                    for by in ('type', 'category', 'date')], False),
+        ('lazy tags', lambda: db.get_transaction_tags([1, 2, 3]), False),
+        ('transactions history filtered', lambda: db.query_transactions(
+            start_date=last_30, end_date=today, types=['Expense'], categories=['Food'],
+            search='pay', order_by='date', ascending=False), False),
+        ('reports period', lambda: db.query_transactions(
+            start_date=last_30, end_date=today, columns=['date', 'type', 'category', 'amount']), False),
+        ('monthly budget expenses', lambda: db.get_monthly_totals(
+            start_month=current_month, end_month=current_month, types=['Expense'],
+            categories=budget_categories), False),
+        ('export range check', lambda: db.query_transactions(
+            start_date=last_30, end_date=today, columns=['id'], limit=1), False),
+        ('export stream', lambda: list(db.iter_transactions(start_date=last_30, end_date=today)), False),
+    ]
+
+
+def full_scans(conn, statement):
+    """Return the guarded tables a statement scans without an index"""
+    plan = conn.execute(f'EXPLAIN QUERY PLAN {statement}').fetchall()
+    tables = []
+    for *_, detail in plan:
+        match = SCAN_PATTERN.match(detail)
+        if match and match.group(1) in GUARDED_TABLES:
+            tables.append(match.group(1))
+    return tables
+
+
+def check_query_plans():
+    """Return a list of (scenario, statement, tables) full-scan regressions"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'finance.db'))
+        seed(db)
+
+        failures = []
+        for name, run, full_scan_ok in scenarios(db):
+            statements = []
+            db.connections.set_trace_callback(statements.append)
+            try:
+                run()
+            finally:
+                db.connections.set_trace_callback(None)
+
+            with db.connections.reader() as conn:
+                for statement in statements:
+                    if not statement.lstrip().upper().startswith('SELECT'):
+                        continue
+                    tables = full_scans(conn, statement)
+                    if tables and not full_scan_ok:
+                        failures.append((name, statement, tables))
+        db.close()
+    return failures
+
+
+def main():
+    failures = check_query_plans()
+    for name, statement, tables in failures:
+        print(f"FULL SCAN of {', '.join(tables)} in {name}:\n    {' '.join(statement.split())}")
+    if failures:
+        return 1
+    print("All queries use an index.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""Measure cold start: module import times, opening the database and the first render of main.py.
+
+Run from the project root:
+
+    python -m benchmarks.startup --rows 10000 --output startup_results.json
+
+Every measurement runs in a fresh interpreter so nothing is already imported.
+Import times are what each module adds on top of streamlit and pandas, which
+every run of the app loads anyway. The first render is one AppTest run of
+main.py against a seeded database; it also reports which page modules and
+plotting libraries that run had to import.
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from database import Database
+from benchmarks.pages import ROOT, seeded_database
+from benchmarks.suite import environment
+
+MODULES = [
+    'database',
+    'components.dashboard',
+    'components.transactions',
+    'components.budget',
+    'components.reports',
+    'components.settings',
+    'components.savings_calculator',
+    'components.data_operations',
+    'plotly.express',
+    'plotly.graph_objects',
+]
+
+IMPORT_SCRIPT = '''
+import time, streamlit, pandas
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+'''
+
+BASE_SCRIPT = '''
+import time
+start = time.perf_counter()
+import streamlit, pandas
+print(time.perf_counter() - start)
+'''
+
+RENDER_SCRIPT = '''
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({main!r}, default_timeout=300)
+start = time.perf_counter()
+at.run()
+seconds = time.perf_counter() - start
+print(json.dumps({{
+    'seconds': seconds,
+    'exceptions': [str(e.value) for e in at.exception],
+    'modules': sorted(name for name in sys.modules
+                      if name.startswith('components.') or name in ('plotly.express', 'plotly.graph_objects')),
+}}))
+'''
+
+
+def python(code, cwd=ROOT):
+    """Run code in a fresh interpreter that can import the app, returning its stdout"""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    return subprocess.run([sys.executable, '-c', code], cwd=cwd, env=env, capture_output=True, text=True,
+                          check=True).stdout
+
+
+def best_of(code, repeat, cwd=ROOT):
+    return min(float(python(code, cwd).splitlines()[-1]) for _ in range(repeat))
+
+
+def import_times(repeat):
+    """Seconds each module adds to a fresh interpreter that already has streamlit and pandas"""
+    times = {'streamlit + pandas': best_of(BASE_SCRIPT, repeat)}
+    for module in MODULES:
+        times[module] = best_of(IMPORT_SCRIPT.format(module=module), repeat)
+    return times
+
+
+def open_times(path, repeat):
+    """Seconds to open a new database (full migration) and an up-to-date one"""
+    fresh = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            Database(os.path.join(tmp, 'new.db')).close()
+            fresh.append(time.perf_counter() - start)
+    current = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        Database(path).close()
+        current.append(time.perf_counter() - start)
+    return {'new database': min(fresh), 'current schema': min(current)}
+
+
+def first_render(path, repeat):
+    """Best cold first run of main.py, from a working directory holding a copy of the database"""
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copytree(os.path.join(ROOT, '.streamlit'), os.path.join(tmp, '.streamlit'))
+        for _ in range(repeat):
+            shutil.copy(path, os.path.join(tmp, 'finance.db'))
+            output = python(RENDER_SCRIPT.format(main=os.path.join(ROOT, 'main.py')), cwd=tmp)
+            runs.append(json.loads(output.splitlines()[-1]))
+    return min(runs, key=lambda run: run['seconds'])
+
+
+def run(rows=10000, repeat=3, data_dir=None, seed=0, log=print):
+    """Take every startup measurement and return the JSON-ready results dict"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = seeded_database(rows, seed, data_dir or tmp)
+
+        log(f"Imports (best of {repeat}, on top of streamlit and pandas)")
+        imports = import_times(repeat)
+        for module, seconds in imports.items():
+            log(f"  {module:<34}{seconds * 1000:>9.1f} ms")
+
+        log("Opening the database")
+        opens = open_times(path, repeat)
+        for name, seconds in opens.items():
+            log(f"  {name:<34}{seconds * 1000:>9.1f} ms")
+
+        render = first_render(path, repeat)
+        log(f"First render of main.py on {rows:,} rows: {render['seconds'] * 1000:.0f} ms")
+        log(f"  imported: {', '.join(render['modules'])}")
+        for error in render['exceptions']:
+            log(f"  exception: {error}")
+
+    return {'environment': environment(), 'rows': rows, 'repeat': repeat, 'imports': imports,
+            'database_open': opens, 'first_render': render}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', help='keep the generated database here and reuse it on later runs')
+    parser.add_argument('--output', help='also write the results as JSON')
+    args = parser.parse_args()
+
+    data_dir = os.path.abspath(args.data_dir) if args.data_dir else None
+    if data_dir:
+        os.makedirs(data_dir, exist_ok=True)
+    results = run(args.rows, args.repeat, data_dir, args.seed)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote startup results to {args.output}")
+    return 1 if results['first_render']['exceptions'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
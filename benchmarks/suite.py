@@ -0,0 +1,249 @@
+"""Time Database methods, alerts and page aggregations on synthetic data of several sizes.
+
+Run from the project root:
+
+    python -m benchmarks.suite --sizes 10000 100000 1000000 --output results.json
+    python -m benchmarks.suite --sizes 10000 --compare results.json
+
+Each size gets a throwaway database filled by benchmarks.synthetic (pass
+--data-dir to keep and reuse them between runs). Reads run against a Database
+with the result cache disabled, so every call reaches SQLite; cached reads are
+timed separately. Results, with the environment they were measured in, are
+written as JSON so runs can be compared with --compare.
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from database import Database
+from benchmarks.synthetic import SyntheticConfig, make_transactions, populate
+from components.aggregation import bucket_totals, fill_periods
+from components.data_operations import iter_export
+from components.notifications import check_budget_alerts, check_financial_goal_alerts
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+def read_cases(db, config):
+    """Read-only cases as (group, name, callable), all relative to the synthetic end date"""
+    end = pd.Timestamp(config.end_date)
+    last_30 = end - pd.Timedelta(days=30)
+    year_ago = end - pd.Timedelta(days=365)
+    month = end.strftime('%Y-%m')
+    middle, _, _ = db.page_transactions(1, start_date=year_ago, end_date=end, columns=['id', 'date'])
+    middle_key = (middle['date'].iloc[0] - pd.Timedelta(days=180), 0)
+    budget_categories = db.get_budget_goals()['category'].tolist()
+
+    def dashboard():
+        summary = db.get_summary()
+        fill_periods(pd.DataFrame(summary['monthly_trends']).fillna(0))
+        expenses = db.query_transactions(start_date=last_30, end_date=end, types=['Expense'],
+                                         columns=['category', 'amount'])
+        expenses.groupby('category')['amount'].sum()
+        db.get_tag_counts(limit=5, start_date=last_30, end_date=end, types=['Expense'])
+
+    def transactions_page():
+        filters = dict(start_date=year_ago, end_date=end)
+        db.get_transaction_totals('type', **filters)
+        db.get_transaction_totals('category', **filters)
+        daily = db.get_transaction_totals('date', **filters)
+        bucket_totals(daily['date'], daily['amount'], 'month')
+        page, _, _ = db.page_transactions(50, columns=['id', 'date', 'type', 'category', 'amount', 'description'],
+                                          compact=True, **filters)
+        db.get_transaction_tags(page['id'])
+
+    def reports_page():
+        data = db.query_transactions(columns=['date', 'type', 'category', 'amount'])
+        expenses = data[data['type'] == 'Expense']
+        bucket_totals(expenses['date'], expenses['amount'], 'day')
+        expenses.groupby('category')['amount'].sum()
+
+    def budget_page():
+        check_budget_alerts(db, 80)
+        check_financial_goal_alerts(db, 7)
+        db.get_monthly_totals(start_month=month, end_month=month, types=['Expense'],
+                              categories=budget_categories)
+
+    return [
+        ('database', 'get_transactions', db.get_transactions),
+        ('database', 'query_transactions year', lambda: db.query_transactions(start_date=year_ago, end_date=end)),
+        ('database', 'query_transactions compact year',
+         lambda: db.query_transactions(start_date=year_ago, end_date=end, compact=True)),
+        ('database', 'query_transactions filtered', lambda: db.query_transactions(
+            start_date=year_ago, end_date=end, types=['Expense'], categories=['Food'], order_by='date')),
+        ('database', 'page_transactions first', lambda: db.page_transactions(50)),
+        ('database', 'page_transactions deep', lambda: db.page_transactions(50, after=middle_key)),
+        ('database', 'get_transaction_totals by date', lambda: db.get_transaction_totals('date')),
+        ('database', 'search_transactions', lambda: db.search_transactions('market groc')),
+        ('database', 'query_transactions search', lambda: db.query_transactions(search='coffee', tags=['tag001'])),
+        ('database', 'get_tag_counts', db.get_tag_counts),
+        ('database', 'get_transaction_date_range', db.get_transaction_date_range),
+        ('database', 'get_monthly_totals', db.get_monthly_totals),
+        ('database', 'get_summary', db.get_summary),
+        ('database', 'iter_transactions all', lambda: sum(len(batch) for batch in db.iter_transactions())),
+        ('database', 'get_all_categories', db.get_all_categories),
+        ('database', 'get_budget_goals', db.get_budget_goals),
+        ('database', 'get_financial_goals', db.get_financial_goals),
+        ('database', 'get_recurring_transactions', db.get_recurring_transactions),
+        ('database', 'get_notification_settings', db.get_notification_settings),
+        ('alerts', 'check_budget_alerts', lambda: check_budget_alerts(db, 80)),
+        ('alerts', 'check_financial_goal_alerts', lambda: check_financial_goal_alerts(db, 7)),
+        ('pages', 'dashboard', dashboard),
+        ('pages', 'transactions', transactions_page),
+        ('pages', 'reports', reports_page),
+        ('pages', 'budget', budget_page),
+        ('pages', 'export csv', lambda: sum(len(chunk) for chunk in iter_export(db, 'CSV', None, None))),
+    ]
+
+
+def write_cases(db, config):
+    """Cases that change the database; they run last"""
+    end = pd.Timestamp(config.end_date)
+    batch = make_transactions(SyntheticConfig.for_rows(1000, years=config.years, seed=config.seed + 7),
+                              db.get_all_categories()).head(1000)
+    return [
+        ('writes', 'add_transaction', lambda: db.add_transaction(
+            end.strftime('%Y-%m-%d'), 'Expense', 'Food', 12.34, 'benchmark', ['bench'])),
+        ('writes', 'add_transactions 1000', lambda: db.add_transactions(batch)),
+        ('writes', 'generate_recurring_transactions', lambda: db.generate_recurring_transactions(end)),
+        ('writes', 'rebuild_monthly_totals', db.rebuild_monthly_totals),
+    ]
+
+
+def time_case(func, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    return runs
+
+
+def database_for(size, config, data_dir):
+    """Open (and fill, if new) the synthetic database for a size"""
+    path = os.path.join(data_dir, f'synthetic_{size}_{config.seed}.db')
+    fresh = not os.path.exists(path)
+    db = Database(path, cache_size=0)
+    load_seconds = None
+    if fresh:
+        start = time.perf_counter()
+        populate(db, config)
+        load_seconds = time.perf_counter() - start
+    return db, path, load_seconds
+
+
+def run(sizes, repeat=3, data_dir=None, seed=0, log=print):
+    """Benchmark every size and return the JSON-ready results dict"""
+    results = []
+    datasets = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            config = SyntheticConfig.for_rows(size, seed=seed)
+            db, path, load_seconds = database_for(size, config, data_dir or tmp)
+            with db.connections.reader() as conn:
+                rows = conn.execute('SELECT COUNT(*) FROM transactions').fetchone()[0]
+            datasets.append({'size': size, 'rows': rows, 'load_seconds': load_seconds,
+                             'file_bytes': os.path.getsize(path)})
+            log(f"{size:,} target rows: {rows:,} transactions" +
+                (f", generated in {load_seconds:.1f}s" if load_seconds else ''))
+
+            cached = Database(path)
+            cases = read_cases(db, config) + [
+                ('database', 'get_summary cached', cached.get_summary),
+                ('database', 'query_transactions year cached', lambda: cached.query_transactions(
+                    start_date=pd.Timestamp(config.end_date) - pd.Timedelta(days=365),
+                    end_date=pd.Timestamp(config.end_date))),
+            ]
+            if data_dir is None:
+                # Reused databases stay unchanged so later runs measure the same data
+                cases += write_cases(db, config)
+
+            for group, name, func in cases:
+                func()  # warm up connections, page cache and the result cache
+                runs = time_case(func, repeat)
+                results.append({
+                    'size': size, 'group': group, 'name': name,
+                    'best': min(runs), 'median': statistics.median(runs), 'runs': runs,
+                })
+                log(f"  {group:<9}{name:<36}{min(runs) * 1000:>10.2f} ms")
+            cached.close()
+            db.close()
+
+    return {'environment': environment(), 'repeat': repeat, 'seed': seed, 'datasets': datasets, 'results': results}
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'sqlite': sqlite3.sqlite_version,
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+    }
+
+
+def compare(current, baseline_path, threshold=1.2):
+    """Print each case's best time against a previous results file and return the regressions"""
+    with open(baseline_path) as f:
+        baseline = {(r['size'], r['group'], r['name']): r['best'] for r in json.load(f)['results']}
+    regressions = []
+    print(f"\n{'size':>10}  {'case':<46}{'before':>10}{'after':>10}{'ratio':>8}")
+    for result in current['results']:
+        key = (result['size'], result['group'], result['name'])
+        if key not in baseline:
+            continue
+        ratio = result['best'] / baseline[key] if baseline[key] else float('inf')
+        flag = '  SLOWER' if ratio > threshold else ''
+        print(f"{result['size']:>10,}  {result['group'] + ' ' + result['name']:<46}"
+              f"{baseline[key] * 1000:>9.1f}ms{result['best'] * 1000:>8.1f}ms{ratio:>7.2f}x{flag}")
+        if ratio > threshold:
+            regressions.append(key)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', help='keep generated databases here and reuse them on later runs')
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', help='previous results file to compare against')
+    parser.add_argument('--threshold', type=float, default=1.2, help='slowdown ratio reported as a regression')
+    args = parser.parse_args()
+
+    if args.data_dir:
+        os.makedirs(args.data_dir, exist_ok=True)
+    results = run(args.sizes, args.repeat, args.data_dir, args.seed)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {len(results['results'])} timings to {args.output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} case(s) slower than {args.threshold}x the baseline")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
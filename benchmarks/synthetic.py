@@ -0,0 +1,142 @@
+"""Reproducible synthetic finance data for benchmarks.
+
+Populate a throwaway database from the project root:
+
+    python -m benchmarks.synthetic /tmp/bench.db --rows 100000
+
+Everything is drawn from a seeded numpy Generator, so the same configuration
+always produces the same database. Rows go through
+Database.add_transaction_chunks, as file imports do, and the recurring
+generator, so triggers, the rollup and the search index are built exactly as
+they are for real data.
+"""
+import argparse
+import sys
+from dataclasses import dataclass, asdict
+
+import numpy as np
+import pandas as pd
+
+from database import Database
+
+MERCHANTS = ['Corner Market', 'City Transit', 'Green Grocer', 'Cinema Plaza', 'Book Nook', 'Pharmacy Plus',
+             'Power & Light', 'Online Store', 'Coffee House', 'Gas Station', 'Fitness Club', 'Landlord']
+DESCRIPTION_WORDS = ['weekly', 'monthly', 'refill', 'order', 'subscription', 'payment', 'visit', 'ticket',
+                     'bill', 'groceries', 'lunch', 'dinner', 'fuel', 'repair', 'gift']
+FREQUENCIES = ['Daily', 'Weekly', 'Monthly', 'Yearly']
+
+
+@dataclass
+class SyntheticConfig:
+    years: float = 2.0
+    transactions_per_day: float = 15.0
+    income_share: float = 0.08
+    categories: int = 0           # extra custom expense categories on top of the defaults
+    tags: int = 50                # size of the tag vocabulary
+    tags_per_transaction: float = 1.2
+    tag_skew: float = 1.3         # Zipf exponent; higher means a few tags dominate
+    recurring: int = 40
+    budgets: bool = True
+    goals: int = 10
+    seed: int = 0
+    end_date: str = '2025-01-01'
+
+    @classmethod
+    def for_rows(cls, rows, **overrides):
+        """Configuration producing roughly the given number of transactions"""
+        config = cls(**overrides)
+        config.transactions_per_day = rows / (config.years * 365)
+        return config
+
+
+def _tags(rng, config, n):
+    """Zipf-distributed tag lists, as JSON-ready Python lists"""
+    vocabulary = np.array([f'tag{i:03d}' for i in range(config.tags)])
+    counts = np.minimum(rng.poisson(config.tags_per_transaction, n), 4)
+    weights = 1 / np.arange(1, config.tags + 1) ** config.tag_skew
+    picks = rng.choice(config.tags, size=counts.sum(), p=weights / weights.sum())
+    bounds = np.cumsum(counts)
+    return [list(dict.fromkeys(tags)) for tags in np.split(vocabulary[picks], bounds[:-1])]
+
+
+def make_transactions(config, categories):
+    """Build the synthetic transactions frame for a configuration"""
+    rng = np.random.default_rng(config.seed)
+    end = pd.Timestamp(config.end_date)
+    days = int(config.years * 365)
+    n = int(rng.poisson(config.transactions_per_day * days))
+
+    income = rng.random(n) < config.income_share
+    expense_names = categories.loc[categories['type'] == 'Expense', 'name'].to_numpy()
+    income_names = categories.loc[categories['type'] == 'Income', 'name'].to_numpy()
+    category = np.where(income, rng.choice(income_names, n), rng.choice(expense_names, n))
+    # Income arrives in a few large amounts, expenses in many small ones
+    amount = np.where(income, rng.gamma(4.0, 600.0, n), rng.gamma(1.5, 30.0, n)).round(2) + 0.01
+
+    return pd.DataFrame({
+        'date': end - pd.to_timedelta(np.sort(rng.integers(0, days, n))[::-1], unit='D'),
+        'type': np.where(income, 'Income', 'Expense'),
+        'category': category,
+        'amount': amount,
+        'description': np.char.add(np.char.add(rng.choice(MERCHANTS, n), ' '), rng.choice(DESCRIPTION_WORDS, n)),
+        'tags': _tags(rng, config, n),
+    })
+
+
+def populate(db, config, chunk_size=50000):
+    """Fill db with synthetic transactions, schedules, budgets and goals; returns the transaction count"""
+    rng = np.random.default_rng(config.seed + 1)
+    for i in range(config.categories):
+        db.add_custom_category(f'Custom {i}', 'Expense', '🏷️', '#607D8B', 'synthetic')
+    categories = db.get_all_categories()
+
+    data = make_transactions(config, categories)
+    chunks = (data.iloc[start:start + chunk_size] for start in range(0, len(data), chunk_size))
+    db.add_transaction_chunks(chunks, on_error='abort')
+
+    end = pd.Timestamp(config.end_date)
+    start = end - pd.Timedelta(days=int(config.years * 365))
+    expense_names = categories.loc[categories['type'] == 'Expense', 'name'].tolist()
+    for i in range(config.recurring):
+        schedule_start = start + pd.Timedelta(days=int(rng.integers(0, 365)))
+        db.add_recurring_transaction(
+            f'Schedule {i}', 'Expense', str(rng.choice(expense_names)), round(float(rng.gamma(2.0, 40.0)), 2),
+            f'recurring {i}', str(rng.choice(FREQUENCIES, p=[0.02, 0.28, 0.6, 0.1])),
+            schedule_start.strftime('%Y-%m-%d'), None, ['recurring']
+        )
+    db.generate_recurring_transactions(end)
+
+    if config.budgets:
+        monthly = data[data['type'] == 'Expense'].groupby('category')['amount'].sum() / (config.years * 12)
+        for category, spend in monthly.items():
+            db.set_budget_goal(category, round(float(spend * rng.uniform(0.7, 1.3)), 2), 'monthly')
+
+    for i in range(config.goals):
+        target = end + pd.Timedelta(days=int(rng.integers(-30, 720)))
+        db.add_financial_goal(f'Goal {i}', float(rng.integers(1, 50) * 1000), target.strftime('%Y-%m-%d'))
+
+    with db.connections.reader() as conn:
+        return conn.execute('SELECT COUNT(*) FROM transactions').fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('db_path')
+    parser.add_argument('--rows', type=int, default=100000)
+    for name, value in asdict(SyntheticConfig()).items():
+        if isinstance(value, bool):
+            parser.add_argument(f"--{name.replace('_', '-')}", action=argparse.BooleanOptionalAction, default=value)
+        elif name != 'transactions_per_day':
+            parser.add_argument(f"--{name.replace('_', '-')}", type=type(value), default=value)
+    args = vars(parser.parse_args())
+    db_path, rows = args.pop('db_path'), args.pop('rows')
+
+    db = Database(db_path)
+    count = populate(db, SyntheticConfig.for_rows(rows, **args))
+    db.close()
+    print(f"Wrote {count:,} transactions to {db_path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
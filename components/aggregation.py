@@ -0,0 +1,78 @@
+"""Time bucketing for transaction trends.
+
+Dates are turned into integer bucket numbers with datetime64 arithmetic and
+summed with np.bincount, so there is no per-row string formatting and every
+bucket between the first and the last one is present in the result. Bucket
+numbers are pandas Period ordinals, so results come back on a PeriodIndex.
+"""
+import numpy as np
+import pandas as pd
+
+# pandas Period frequency for each bucket size. Weeks run Monday to Sunday.
+FREQUENCIES = {
+    'day': 'D',
+    'week': 'W',
+    'month': 'M',
+    'quarter': 'Q',
+    'year': 'Y',
+}
+
+
+def bucket_codes(dates, freq='month'):
+    """Return the Period ordinal of each date for the bucket size, and a mask of valid dates"""
+    if freq not in FREQUENCIES:
+        raise ValueError(f"Unknown bucket size: {freq}")
+    values = np.asarray(pd.to_datetime(dates), dtype='datetime64[ns]')
+    valid = ~np.isnat(values)
+    if freq in ('day', 'week'):
+        codes = values.astype('datetime64[D]').astype(np.int64)
+        if freq == 'week':
+            # 1970-01-01 was a Thursday and falls in week ordinal 1
+            codes = (codes + 3) // 7 + 1
+    else:
+        codes = values.astype('datetime64[M]').astype(np.int64)
+        if freq == 'quarter':
+            codes = codes // 3
+        elif freq == 'year':
+            codes = codes // 12
+    return codes, valid
+
+
+def _bucket_bounds(codes, freq, start, end):
+    """Resolve the first and last bucket to report, defaulting to the data's own range"""
+    lo = bucket_codes([start], freq)[0][0] if start is not None else (codes.min() if len(codes) else None)
+    hi = bucket_codes([end], freq)[0][0] if end is not None else (codes.max() if len(codes) else None)
+    return lo, hi
+
+
+def period_index(first, count, freq='month'):
+    """PeriodIndex of count consecutive buckets starting at ordinal first"""
+    if count <= 0:
+        return pd.PeriodIndex([], freq=FREQUENCIES[freq])
+    start = pd.Period(ordinal=int(first), freq=FREQUENCIES[freq])
+    return pd.period_range(start=start, periods=count, freq=FREQUENCIES[freq])
+
+
+def bucket_totals(dates, values, freq='month', start=None, end=None):
+    """Sum values per time bucket, with empty buckets between start and end filled with 0"""
+    codes, valid = bucket_codes(dates, freq)
+    amounts = np.asarray(values, dtype=float)
+    codes, amounts = codes[valid], amounts[valid]
+
+    lo, hi = _bucket_bounds(codes, freq, start, end)
+    if lo is None or hi is None or hi < lo:
+        return pd.Series(dtype=float, index=period_index(0, 0, freq))
+    keep = (codes >= lo) & (codes <= hi)
+    totals = np.bincount(codes[keep] - lo, weights=amounts[keep], minlength=hi - lo + 1).astype(float, copy=False)
+    return pd.Series(totals, index=period_index(lo, hi - lo + 1, freq))
+
+
+def fill_periods(totals, freq='month', start=None, end=None):
+    """Reindex totals keyed by period labels such as '2024-01' onto every bucket in the range"""
+    if len(totals) == 0 and (start is None or end is None):
+        return totals.set_axis(period_index(0, 0, freq))
+    index = pd.PeriodIndex(totals.index, freq=FREQUENCIES[freq])
+    first = pd.Period(start, FREQUENCIES[freq]) if start is not None else index.min()
+    last = pd.Period(end, FREQUENCIES[freq]) if end is not None else index.max()
+    full = pd.period_range(start=first, end=last, freq=FREQUENCIES[freq])
+    return totals.set_axis(index).groupby(level=0).sum().reindex(full, fill_value=0)
@@ -1,9 +1,8 @@
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime
 import pandas as pd
-from components.notifications import check_budget_alerts, render_alerts, check_financial_goal_alerts
+from components.notifications import check_budget_alerts, render_alerts, check_financial_goal_alerts, get_alert_settings
+from components.profiling import profiled
 
 def validate_budget_goal(amount, category, existing_goals):
     if amount <= 0:
@@ -25,17 +24,20 @@ def validate_financial_goal(name, amount, target_date):
         return False
     return True
 
+@profiled
 def render_budget(db):
     st.title("Budget Planning")
 
+    threshold, deadline_days = get_alert_settings(db)
+
     # Display budget alerts
-    budget_alerts = check_budget_alerts(db)
+    budget_alerts = check_budget_alerts(db, threshold)
     if budget_alerts:
         st.subheader("Budget Alerts")
         render_alerts(budget_alerts)
 
     # Display financial goal alerts
-    goal_alerts = check_financial_goal_alerts(db)
+    goal_alerts = check_financial_goal_alerts(db, deadline_days)
     if goal_alerts:
         st.subheader("Financial Goal Alerts")
         render_alerts(goal_alerts)
@@ -48,9 +50,11 @@ def render_budget(db):
             col1, col2 = st.columns(2)
 
             with col1:
+                categories = db.get_category_registry()
                 category = st.selectbox(
                     "Category",
-                    ["Food", "Transport", "Housing", "Utilities", "Entertainment", "Shopping", "Healthcare", "Other"]
+                    categories.names_of_type('Expense'),
+                    format_func=categories.label
                 )
 
             with col2:
@@ -69,14 +73,17 @@ def render_budget(db):
         st.subheader("Budget vs Actual Spending")
 
         budget_goals = db.get_budget_goals()
-        transactions = db.get_transactions()
+        first_date, _ = db.get_transaction_date_range()
 
-        if not budget_goals.empty and not transactions.empty:
+        if not budget_goals.empty and first_date is not None:
+            import plotly.graph_objects as go
             current_month = datetime.now().strftime("%Y-%m")
-            monthly_expenses = transactions[
-                (transactions['type'] == 'Expense') &
-                (transactions['date'].dt.strftime("%Y-%m") == current_month)
-            ].groupby('category')['amount'].sum()
+            monthly_expenses = db.get_monthly_totals(
+                start_month=current_month,
+                end_month=current_month,
+                types=['Expense'],
+                categories=budget_goals['category'].tolist()
+            ).set_index('category')['total']
 
             comparison_data = []
             for _, row in budget_goals.iterrows():
@@ -0,0 +1,96 @@
+"""Point budgets for time-series charts.
+
+Long series are downsampled on the server before they are sent to the
+browser. The default, Largest-Triangle-Three-Buckets (LTTB), keeps the
+points that shape the line; 'minmax' keeps each bucket's lowest and highest
+point, so no spike is ever lost. Traces with many points are drawn with
+WebGL (Scattergl), which does not support spline lines, so those fall back to
+straight segments.
+"""
+import numpy as np
+import pandas as pd
+from components.profiling import profiled
+
+# Most points a line chart sends to the browser, roughly one per pixel of a wide chart
+DEFAULT_MAX_POINTS = 2000
+# Traces with more points than this are drawn with WebGL
+WEBGL_MIN_POINTS = 1000
+
+
+def _numeric(index):
+    """Index values as floats for the LTTB area computation"""
+    if isinstance(index, pd.PeriodIndex):
+        index = index.to_timestamp()
+    if isinstance(index, pd.DatetimeIndex):
+        return index.asi8.astype(float)
+    return np.asarray(index, dtype=float)
+
+
+def lttb_indices(x, y, max_points):
+    """Positions of the points LTTB keeps, always including the first and last"""
+    n = len(y)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+    # max_points - 2 buckets over the interior points; each gets one survivor
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(max_points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_lo, next_hi = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x, avg_y = x[next_lo:next_hi].mean(), y[next_lo:next_hi].mean()
+        # Twice the area of the triangle each candidate makes with the previous survivor and the next bucket
+        area = np.abs((x[previous] - avg_x) * (y[lo:hi] - y[previous])
+                      - (x[previous] - x[lo:hi]) * (avg_y - y[previous]))
+        previous = lo + int(area.argmax())
+        selected[i + 1] = previous
+    return selected
+
+
+def minmax_indices(y, max_points):
+    """Positions of each bucket's lowest and highest point, plus the first and last"""
+    n = len(y)
+    if max_points >= n or max_points < 4:
+        return np.arange(n)
+    buckets = (max_points - 2) // 2
+    bucket = np.arange(n) * buckets // n
+    order = np.lexsort((y, bucket))
+    ends = np.searchsorted(bucket[order], np.arange(1, buckets + 1))
+    starts = np.concatenate([[0], ends[:-1]])
+    return np.unique(np.concatenate([[0, n - 1], order[starts], order[ends - 1]]))
+
+
+@profiled
+def downsample(series, max_points=DEFAULT_MAX_POINTS, method='lttb'):
+    """Reduce a series ordered by its index to at most about max_points, keeping its shape"""
+    if len(series) <= max_points:
+        return series
+    values = series.to_numpy(dtype=float)
+    if method == 'lttb':
+        keep = lttb_indices(_numeric(series.index), values, max_points)
+    elif method == 'minmax':
+        keep = minmax_indices(values, max_points)
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    return series.iloc[keep]
+
+
+def line_trace(series, name=None, max_points=DEFAULT_MAX_POINTS, method='lttb', spline=False, **kwargs):
+    """Downsampled line trace for a series, using Scattergl above WEBGL_MIN_POINTS"""
+    import plotly.graph_objects as go
+
+    points = downsample(series, max_points, method)
+    x = points.index.to_timestamp() if isinstance(points.index, pd.PeriodIndex) else points.index
+    if len(points) > WEBGL_MIN_POINTS:
+        return go.Scattergl(x=x, y=points.to_numpy(), name=name, mode='lines', **kwargs)
+    if spline:
+        kwargs['line'] = dict(kwargs.get('line') or {}, shape='spline')
+    return go.Scatter(x=x, y=points.to_numpy(), name=name, mode='lines', **kwargs)
+
+
+def reduction_note(total, shown):
+    """Caption saying how many points a chart left out, or None when it shows them all"""
+    if shown >= total:
+        return None
+    return f"Showing {shown:,} of {total:,} points ({1 - shown / total:.0%} fewer) to keep the chart responsive."
@@ -1,6 +1,4 @@
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
 
 def calculate_financial_health_score(income, expenses, savings, budget_adherence):
     """Calculate financial health score based on various metrics"""
@@ -30,29 +28,25 @@ def calculate_financial_health_score(income, expenses, savings, budget_adherence
 
 import pandas as pd
 from datetime import datetime, timedelta
-from components.notifications import check_budget_alerts, render_alerts, check_financial_goal_alerts
+from components.aggregation import fill_periods
+from components.chart_data import line_trace
+from components.notifications import check_budget_alerts, render_alerts, check_financial_goal_alerts, get_alert_settings
+from components.profiling import profiled
 
+@profiled
 def render_dashboard(db):
     st.title("Financial Dashboard")
 
-    # Check and display alerts
-    budget_alerts = check_budget_alerts(db)
-    goal_alerts = check_financial_goal_alerts(db)
-
-    # Get notification settings
-    settings = db.get_notification_settings()
-    threshold = 80
-    if not settings.empty:
-        threshold = settings.iloc[0]['budget_alert_threshold']
-
-    # Filter alerts based on threshold
-    filtered_budget_alerts = [alert for alert in budget_alerts if alert['percentage'] >= threshold]
+    # Check and display alerts, using the thresholds from Settings
+    threshold, deadline_days = get_alert_settings(db)
+    budget_alerts = check_budget_alerts(db, threshold)
+    goal_alerts = check_financial_goal_alerts(db, deadline_days)
 
     # Render alerts
-    if filtered_budget_alerts or goal_alerts:
+    if budget_alerts or goal_alerts:
         st.subheader("Notifications")
         with st.expander("View Alerts", expanded=True):
-            render_alerts(filtered_budget_alerts)
+            render_alerts(budget_alerts)
             render_alerts(goal_alerts)
 
     # Get summary data
@@ -91,8 +85,12 @@ def render_dashboard(db):
         """, unsafe_allow_html=True)
     with score_col2:
         st.markdown("### Score Breakdown")
-        st.markdown(f"- Income to Expense Ratio: {'Healthy' if expenses/income <= 0.7 else 'Needs Attention'}")
-        st.markdown(f"- Savings Rate: {(savings/income*100):.1f}%")
+        if income > 0:
+            st.markdown(f"- Income to Expense Ratio: {'Healthy' if expenses/income <= 0.7 else 'Needs Attention'}")
+            st.markdown(f"- Savings Rate: {(savings/income*100):.1f}%")
+        else:
+            st.markdown("- Income to Expense Ratio: No income recorded yet")
+            st.markdown("- Savings Rate: No income recorded yet")
         st.markdown(f"- Budget Adherence: {budget_adherence:.1f}%")
     
     st.markdown("---")
@@ -122,37 +120,25 @@ def render_dashboard(db):
         )
 
     # Transaction Overview
-    transactions = db.get_transactions()
-    if not transactions.empty:
+    first_date, _ = db.get_transaction_date_range()
+    if first_date is not None:
+        # Plotly is only imported once there is something to chart
+        import plotly.express as px
+        import plotly.graph_objects as go
+
         # Monthly Trend
         st.subheader("Monthly Income vs Expenses")
-        transactions['date'] = pd.to_datetime(transactions['date'])
 
-        # Calculate monthly trends separately for income and expenses
-        income_monthly = transactions[transactions['type'] == 'Income'].copy()
-        expense_monthly = transactions[transactions['type'] == 'Expense'].copy()
-
-        income_trend = income_monthly.groupby(income_monthly['date'].dt.strftime('%Y-%m'))['amount'].sum()
-        expense_trend = expense_monthly.groupby(expense_monthly['date'].dt.strftime('%Y-%m'))['amount'].sum()
-
-        # Combine all dates for complete timeline
-        all_dates = pd.Series(index=sorted(set(income_trend.index) | set(expense_trend.index))).fillna(0)
-        income_trend = income_trend.reindex(all_dates.index, fill_value=0)
-        expense_trend = expense_trend.reindex(all_dates.index, fill_value=0)
+        # Monthly trends are already aggregated by the summary query; fill in empty months
+        trends = fill_periods(pd.DataFrame({
+            'Income': pd.Series(summary['monthly_trends'].get('Income', {}), dtype=float),
+            'Expense': pd.Series(summary['monthly_trends'].get('Expense', {}), dtype=float),
+        }).fillna(0))
 
+        # Same point budget as the daily charts, though a monthly series rarely reaches it
         fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=income_trend.index,
-            y=income_trend.values,
-            name='Income',
-            line=dict(color='#2E7D32', width=2)
-        ))
-        fig.add_trace(go.Scatter(
-            x=expense_trend.index,
-            y=expense_trend.values,
-            name='Expenses',
-            line=dict(color='#1976D2', width=2)
-        ))
+        fig.add_trace(line_trace(trends['Income'], 'Income', line=dict(color='#2E7D32', width=2)))
+        fig.add_trace(line_trace(trends['Expense'], 'Expenses', line=dict(color='#1976D2', width=2)))
         fig.update_layout(
             title='Monthly Income vs Expenses Trend',
             xaxis_title='Month',
@@ -164,7 +150,6 @@ def render_dashboard(db):
 
         # Category Distribution
         st.subheader("Expense Distribution")
-        expenses = transactions[transactions['type'] == 'Expense'].copy()
 
         # Time period selection for expenses
         period = st.select_slider(
@@ -183,12 +168,14 @@ def render_dashboard(db):
         elif period == 'Year to Date':
             start_date = datetime(end_date.year, 1, 1)
         else:
-            start_date = expenses['date'].min()
+            start_date = first_date
 
-        filtered_expenses = expenses[
-            (expenses['date'] >= start_date) & 
-            (expenses['date'] <= end_date)
-        ]
+        filtered_expenses = db.query_transactions(
+            start_date=start_date,
+            end_date=end_date,
+            types=['Expense'],
+            columns=['category', 'amount']
+        )
 
         if not filtered_expenses.empty:
             col1, col2 = st.columns(2)
@@ -224,10 +211,14 @@ def render_dashboard(db):
 
             # Transaction tags word cloud
             st.subheader("Popular Transaction Tags")
-            all_tags = [tag for tags in filtered_expenses['tags'] for tag in tags if tags]
-            if all_tags:
-                tag_counts = pd.Series(all_tags).value_counts()
-                st.write("Most used tags:", ", ".join(tag_counts.head().index))
+            tag_counts = db.get_tag_counts(
+                limit=5,
+                start_date=start_date,
+                end_date=end_date,
+                types=['Expense']
+            )
+            if not tag_counts.empty:
+                st.write("Most used tags:", ", ".join(tag_counts.index))
 
             # Summary statistics
             st.subheader("Summary Statistics")
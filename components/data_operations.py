@@ -2,9 +2,132 @@
 import streamlit as st
 import pandas as pd
 import json
+import csv
 from datetime import datetime
 import io
+from database import TRANSACTION_COLUMNS
+from components.profiling import profiled
 
+# Rows validated and inserted at a time when importing, which bounds memory use
+IMPORT_CHUNK_SIZE = 10000
+
+def is_json_lines(uploaded_file):
+    """Tell line-delimited JSON apart from a single JSON document"""
+    uploaded_file.seek(0)
+    first_line = uploaded_file.readline().strip()
+    uploaded_file.seek(0)
+    try:
+        record = json.loads(first_line)
+    except ValueError:
+        return False
+    # A one-line document in pandas' default 'columns' orient nests a dict per column
+    return isinstance(record, dict) and not all(isinstance(value, dict) for value in record.values())
+
+def read_import_preview(uploaded_file, import_format, rows=5):
+    """Read only the first rows of an uploaded file"""
+    uploaded_file.seek(0)
+    if import_format == "CSV":
+        return pd.read_csv(uploaded_file, nrows=rows)
+    elif import_format == "Excel":
+        return pd.read_excel(uploaded_file, nrows=rows)
+    elif is_json_lines(uploaded_file):
+        return pd.read_json(uploaded_file, lines=True, nrows=rows)
+    return pd.read_json(uploaded_file).head(rows)
+
+def read_import_chunks(uploaded_file, import_format, chunksize=IMPORT_CHUNK_SIZE):
+    """Yield an uploaded file as DataFrames of at most chunksize rows"""
+    uploaded_file.seek(0)
+    if import_format == "CSV":
+        with pd.read_csv(uploaded_file, chunksize=chunksize) as reader:
+            yield from reader
+    elif import_format == "JSON" and is_json_lines(uploaded_file):
+        with pd.read_json(uploaded_file, lines=True, chunksize=chunksize) as reader:
+            yield from reader
+    elif import_format == "Excel":
+        # Workbooks and JSON documents can only be parsed whole
+        yield pd.read_excel(uploaded_file)
+    else:
+        yield pd.read_json(uploaded_file)
+
+# Rows fetched from the database cursor per export chunk
+EXPORT_CHUNK_SIZE = 5000
+
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "JSON": ("json", "application/json"),
+    "JSON Lines": ("jsonl", "application/x-ndjson"),
+}
+
+def iter_export_records(columns, batches):
+    """Yield each batch of exported rows as dicts with tags decoded to lists"""
+    for rows in batches:
+        records = [dict(zip(columns, row)) for row in rows]
+        if 'tags' in columns:
+            for record in records:
+                record['tags'] = json.loads(record['tags']) if record['tags'] else []
+        yield records
+
+def iter_csv(columns, batches):
+    """Yield CSV bytes one batch of rows at a time"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(columns)
+    for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue().encode()
+
+def iter_ndjson(columns, batches):
+    """Yield line-delimited JSON bytes, one object per transaction"""
+    for records in iter_export_records(columns, batches):
+        yield ''.join(json.dumps(record) + '\n' for record in records).encode()
+
+def iter_json_array(columns, batches):
+    """Yield a JSON array of transaction objects one batch at a time"""
+    yield b'['
+    separator = ''
+    for records in iter_export_records(columns, batches):
+        if records:
+            yield (separator + ','.join(json.dumps(record) for record in records)).encode()
+            separator = ','
+    yield b']'
+
+def iter_excel(columns, batches):
+    """Yield an Excel workbook written row by row in openpyxl's write-only mode"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Transactions")
+    sheet.append(columns)
+    for rows in batches:
+        for row in rows:
+            sheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    yield buffer.getvalue()
+
+EXPORT_WRITERS = {
+    "CSV": iter_csv,
+    "Excel": iter_excel,
+    "JSON": iter_json_array,
+    "JSON Lines": iter_ndjson,
+}
+
+def iter_export(db, export_format, start_date, end_date):
+    """Stream transactions in the date range through the writer for export_format"""
+    columns = list(TRANSACTION_COLUMNS)
+    batches = db.iter_transactions(
+        columns=columns,
+        chunk_size=EXPORT_CHUNK_SIZE,
+        start_date=start_date,
+        end_date=end_date
+    )
+    return EXPORT_WRITERS[export_format](columns, batches)
+
+@profiled
 def render_data_operations(db):
     st.title("Data Import/Export")
     
@@ -14,52 +137,40 @@ def render_data_operations(db):
         st.header("Export Data")
         
         # Get data
-        transactions = db.get_transactions()
-        if not transactions.empty:
+        first_date, last_date = db.get_transaction_date_range()
+        if first_date is not None:
             # Format selection
             export_format = st.selectbox(
                 "Select Export Format",
-                ["CSV", "Excel", "JSON"],
+                list(EXPORT_FORMATS),
                 key="export_format"
             )
             
             # Date range filter
             col1, col2 = st.columns(2)
             with col1:
-                start_date = st.date_input("Start Date", transactions['date'].min())
+                start_date = st.date_input("Start Date", first_date)
             with col2:
-                end_date = st.date_input("End Date", transactions['date'].max())
+                end_date = st.date_input("End Date", last_date)
             
-            # Filter data
-            mask = (transactions['date'].dt.date >= start_date) & (transactions['date'].dt.date <= end_date)
-            filtered_data = transactions[mask].copy()
+            # Check the range is not empty without loading it
+            has_data = not db.query_transactions(
+                start_date=start_date, end_date=end_date, columns=['id'], limit=1
+            ).empty
             
-            if not filtered_data.empty:
-                # Prepare data for export
-                export_data = filtered_data.copy()
-                export_data['date'] = export_data['date'].dt.strftime('%Y-%m-%d')
-                
-                if export_format == "CSV":
-                    data = export_data.to_csv(index=False)
-                    mime = "text/csv"
-                    ext = "csv"
-                elif export_format == "Excel":
-                    buffer = io.BytesIO()
-                    export_data.to_excel(buffer, index=False)
-                    data = buffer.getvalue()
-                    mime = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                    ext = "xlsx"
-                else:  # JSON
-                    data = export_data.to_json(orient='records', date_format='iso')
-                    mime = "application/json"
-                    ext = "json"
-                
-                st.download_button(
-                    f"Download {export_format}",
-                    data=data,
-                    file_name=f"transactions_{datetime.now().strftime('%Y%m%d')}.{ext}",
-                    mime=mime
-                )
+            if has_data:
+                if st.button("Prepare Export"):
+                    ext, mime = EXPORT_FORMATS[export_format]
+                    data = b''.join(iter_export(db, export_format, start_date, end_date))
+                    
+                    st.download_button(
+                        f"Download {export_format}",
+                        data=data,
+                        file_name=f"transactions_{datetime.now().strftime('%Y%m%d')}.{ext}",
+                        mime=mime
+                    )
+            else:
+                st.info("No transactions in the selected date range.")
         else:
             st.info("No transactions available to export.")
     
@@ -74,45 +185,61 @@ def render_data_operations(db):
         
         uploaded_file = st.file_uploader(
             f"Upload {import_format} file",
-            type=[import_format.lower()],
-            help=f"Upload a {import_format} file containing transactions"
+            type=["json", "jsonl", "ndjson"] if import_format == "JSON" else [import_format.lower()],
+            help=f"Upload a {import_format} file containing transactions. "
+                 "CSV and line-delimited JSON files are imported in chunks, so they can be very large."
         )
         
         if uploaded_file is not None:
             try:
-                if import_format == "CSV":
-                    data = pd.read_csv(uploaded_file)
-                elif import_format == "Excel":
-                    data = pd.read_excel(uploaded_file)
-                else:  # JSON
-                    data = pd.read_json(uploaded_file)
+                preview = read_import_preview(uploaded_file, import_format)
                 
                 # Validate required columns
                 required_columns = ['date', 'type', 'category', 'amount', 'description']
-                if not all(col in data.columns for col in required_columns):
+                if not all(col in preview.columns for col in required_columns):
                     st.error("File must contain columns: date, type, category, amount, description")
                     return
                 
                 # Preview data
                 st.subheader("Preview")
-                st.dataframe(data.head())
+                st.dataframe(preview)
                 
+                skip_invalid = st.radio(
+                    "If some rows are invalid",
+                    ["Skip invalid rows", "Import nothing"],
+                    horizontal=True
+                ) == "Skip invalid rows"
+
                 if st.button("Import Data", type="primary"):
-                    for _, row in data.iterrows():
-                        try:
-                            db.add_transaction(
-                                date=row['date'],
-                                type=row['type'],
-                                category=row['category'],
-                                amount=float(row['amount']),
-                                description=row['description'],
-                                tags=row.get('tags', [])
-                            )
-                        except Exception as e:
-                            st.error(f"Error importing row: {str(e)}")
-                            continue
-                    
-                    st.success(f"Successfully imported {len(data)} transactions!")
+                    progress_bar = st.progress(0.0, text="Importing...")
+
+                    def show_progress(report):
+                        done = uploaded_file.tell() / uploaded_file.size if uploaded_file.size else 1.0
+                        progress_bar.progress(
+                            min(done, 1.0),
+                            text=f"Processed {report['total']:,} rows, imported {report['inserted']:,}"
+                        )
+
+                    try:
+                        report = db.add_transaction_chunks(
+                            read_import_chunks(uploaded_file, import_format),
+                            on_error='skip' if skip_invalid else 'abort',
+                            progress=show_progress
+                        )
+                    except Exception as e:
+                        st.error(f"Import failed, no transactions were imported: {str(e)}")
+                        return
+                    progress_bar.progress(1.0, text=f"Processed {report['total']:,} rows")
+
+                    if report['inserted']:
+                        st.success(f"Successfully imported {report['inserted']} of {report['total']} transactions!")
+                    if report['failed']:
+                        if not skip_invalid:
+                            st.error("No transactions were imported because some rows are invalid.")
+                        with st.expander(f"{report['failed']} rows were not imported", expanded=True):
+                            if report['failed'] > len(report['errors']):
+                                st.caption(f"Showing the first {len(report['errors'])} rejected rows")
+                            st.dataframe(pd.DataFrame(report['errors']), use_container_width=True, hide_index=True)
                     
             except Exception as e:
                 st.error(f"Error reading file: {str(e)}")
@@ -0,0 +1,79 @@
+"""Closed-form savings math, vectorized with NumPy.
+
+Every function takes scalars or arrays and broadcasts them against each
+other, so one call can price a single plan, a 600-month timeline or a grid of
+(rate, horizon) scenarios. Amounts are from the saver's point of view: the
+starting balance, contributions and target are all positive, unlike the
+signed cash flows of spreadsheet-style PMT/FV functions. Rates are fractions
+per year (0.05 for 5%).
+"""
+import numpy as np
+import pandas as pd
+
+# Times per year interest is added to the balance
+COMPOUNDING = {
+    'Daily': 365,
+    'Monthly': 12,
+    'Quarterly': 4,
+    'Annually': 1,
+}
+
+# When each contribution is made within its period
+TIMING = ('end', 'begin')
+
+
+def periodic_rate(annual_rate, periods_per_year=12, compounding=12):
+    """Effective rate per contribution period for a nominal annual rate compounded compounding times a year"""
+    annual_rate = np.asarray(annual_rate, dtype=float)
+    return np.expm1(compounding / periods_per_year * np.log1p(annual_rate / compounding))
+
+
+def growth_factor(rate, periods):
+    """(1 + rate) ** periods"""
+    return np.exp(np.asarray(periods, dtype=float) * np.log1p(np.asarray(rate, dtype=float)))
+
+
+def annuity_factor(rate, periods, when='end'):
+    """Balance built by contributing 1 every period for periods periods"""
+    if when not in TIMING:
+        raise ValueError(f"Unknown contribution timing: {when}")
+    rate = np.asarray(rate, dtype=float)
+    periods = np.asarray(periods, dtype=float)
+    grown = np.expm1(periods * np.log1p(rate))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        factor = np.where(rate == 0, periods, grown / rate)
+    if when == 'begin':
+        factor = factor * (1 + rate)
+    return factor
+
+
+def future_value(rate, periods, present_value=0.0, payment=0.0, when='end'):
+    """Balance after periods periods of growth and contributions"""
+    return present_value * growth_factor(rate, periods) + payment * annuity_factor(rate, periods, when)
+
+
+def payment(rate, periods, present_value, future_value, when='end'):
+    """Contribution per period that grows present_value into future_value; negative when none is needed"""
+    factor = annuity_factor(rate, periods, when)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = (future_value - present_value * growth_factor(rate, periods)) / factor
+    return np.where(factor > 0, result, np.nan)
+
+
+def balance_timeline(rate, periods, present_value, payment, when='end'):
+    """Balance at the end of each period from 0 to periods, along the last axis"""
+    steps = np.arange(int(periods) + 1)
+    rate = np.asarray(rate, dtype=float)[..., np.newaxis]
+    present_value = np.asarray(present_value, dtype=float)[..., np.newaxis]
+    payment = np.asarray(payment, dtype=float)[..., np.newaxis]
+    return future_value(rate, steps, present_value, payment, when)
+
+
+def payment_grid(annual_rates, years, present_value, target, periods_per_year=12, compounding=12, when='end'):
+    """Contribution per period for every (rate, horizon) pair, rates down the side and years across"""
+    annual_rates = np.asarray(annual_rates, dtype=float)
+    years = np.asarray(years, dtype=float)
+    rate = periodic_rate(annual_rates, periods_per_year, compounding)[:, np.newaxis]
+    periods = np.round(years * periods_per_year)[np.newaxis, :]
+    return pd.DataFrame(payment(rate, periods, present_value, target, when),
+                        index=pd.Index(annual_rates, name='rate'), columns=pd.Index(years, name='years'))
@@ -0,0 +1,139 @@
+"""Monte Carlo savings projections.
+
+Monthly returns are drawn as log-normal around the same monthly rate the
+fixed-rate plan compounds (components.finance_math.periodic_rate), so with
+zero volatility every path follows that plan exactly. Each path's balance is built with cumulative sums instead of
+a month-by-month loop: with G_t the growth of 1 from month 0 to t, the
+balance is B_t = G_t * (B_0 + sum of c_k / G_k). Paths are simulated in
+fixed-size chunks, each with its own child of the seed, so a seeded run gives
+the same result whether the chunks run in this process or, for large runs,
+across a process pool. Balances and the target are in nominal dollars;
+inflation only converts the final balances to today's dollars.
+"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+from components.finance_math import periodic_rate
+from components.profiling import profiled
+
+# Paths simulated together; bounds the memory of one chunk to a few paths x months arrays
+CHUNK_PATHS = 5000
+# Runs with at least this many simulated months (paths x months) are split across processes
+PARALLEL_MIN_PATH_MONTHS = 20_000_000
+# Most time points kept per path for the percentile bands
+MAX_CHECKPOINTS = 120
+PERCENTILES = (10, 50, 90)
+# Balances within half a cent of the target count as reaching it
+TARGET_TOLERANCE = 0.005
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def default_workers():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _executor(workers):
+    """Process pool shared by later runs; spawned, since Streamlit serves sessions from threads"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(workers, mp_context=get_context('spawn'))
+            _pool_workers = workers
+        return _pool
+
+
+def contribution_schedule(monthly_contribution, months, contribution_growth=0.0):
+    """Contribution for each month 1..months, raised by contribution_growth once a year"""
+    years = np.arange(months) // 12
+    return monthly_contribution * (1 + contribution_growth) ** years
+
+
+def _simulate_chunk(task):
+    """Simulate one chunk of paths; returns balances at the checkpoints and whether each path hit the target"""
+    seed, paths, current_savings, contributions, mu, sigma, checkpoints, target, when = task
+    rng = np.random.default_rng(seed)
+    months = len(contributions)
+
+    log_growth = rng.normal(mu, sigma, (paths, months))
+    np.cumsum(log_growth, axis=1, out=log_growth)
+    # Each contribution divided by the growth of 1 up to the month it starts compounding
+    flows = np.empty_like(log_growth)
+    if when == 'begin':
+        flows[:, 0] = 0.0
+        np.negative(log_growth[:, :-1], out=flows[:, 1:])
+    else:
+        np.negative(log_growth, out=flows)
+    np.exp(flows, out=flows)
+    flows *= contributions
+    np.cumsum(flows, axis=1, out=flows)
+    flows += current_savings
+    np.exp(log_growth, out=log_growth)
+    flows *= log_growth
+
+    balances = np.empty((paths, len(checkpoints)))
+    balances[:, 0] = current_savings
+    balances[:, 1:] = flows[:, checkpoints[1:] - 1]
+    reached = (flows >= target - TARGET_TOLERANCE).any(axis=1) | (current_savings >= target - TARGET_TOLERANCE)
+    return balances, reached
+
+
+@profiled
+def simulate_savings(target_amount, current_savings, monthly_contribution, months, mean_return=0.07,
+                     volatility=0.15, inflation=0.0, contribution_growth=0.0, when='end', paths=10000,
+                     seed=None, workers=None, compounding=12):
+    """Project savings over many random return paths.
+
+    Rates are annual fractions; mean_return is a nominal rate compounded
+    compounding times a year, like the fixed-rate plan's. Returns a dict with
+    the P10/P50/P90 balance bands by month, the final-balance percentiles
+    (also in today's dollars as 'final_real'), and the probability of ending
+    at or above target_amount and of reaching it at any point.
+    """
+    if months < 1 or paths < 1:
+        raise ValueError("Months and paths must be at least 1")
+    if when not in ('end', 'begin'):
+        raise ValueError(f"Unknown contribution timing: {when}")
+    sigma = volatility / np.sqrt(12)
+    # Log-normal monthly returns whose mean is the plan's monthly rate
+    mu = float(np.log1p(periodic_rate(mean_return, 12, compounding))) - sigma ** 2 / 2
+    contributions = contribution_schedule(monthly_contribution, months, contribution_growth)
+    checkpoints = np.unique(np.linspace(0, months, min(months, MAX_CHECKPOINTS) + 1).round().astype(np.int64))
+
+    sizes = [CHUNK_PATHS] * (paths // CHUNK_PATHS) + ([paths % CHUNK_PATHS] if paths % CHUNK_PATHS else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(child, size, current_savings, contributions, mu, sigma, checkpoints, target_amount, when)
+             for child, size in zip(seeds, sizes)]
+
+    workers = default_workers() if workers is None else workers
+    parallel = workers > 1 and len(tasks) > 1 and paths * months >= PARALLEL_MIN_PATH_MONTHS
+    if parallel:
+        results = list(_executor(workers).map(_simulate_chunk, tasks))
+    else:
+        results = [_simulate_chunk(task) for task in tasks]
+    balances = np.concatenate([balances for balances, _ in results])
+    reached = np.concatenate([reached for _, reached in results])
+
+    bands = np.percentile(balances, PERCENTILES, axis=0)
+    deflator = (1 + inflation) ** (months / 12)
+    return {
+        'bands': pd.DataFrame(bands.T, index=pd.Index(checkpoints, name='month'),
+                              columns=[f'P{p}' for p in PERCENTILES]),
+        'final': {f'P{p}': float(value) for p, value in zip(PERCENTILES, bands[:, -1])},
+        'final_real': {f'P{p}': float(value / deflator) for p, value in zip(PERCENTILES, bands[:, -1])},
+        'probability': float((balances[:, -1] >= target_amount - TARGET_TOLERANCE).mean()),
+        'probability_any': float(reached.mean()),
+        'paths': paths,
+        'parallel': parallel,
+    }
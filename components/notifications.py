@@ -1,50 +1,72 @@
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import datetime
+from components.profiling import profiled
 
-def check_budget_alerts(db):
+DEFAULT_BUDGET_THRESHOLD = 80
+DEFAULT_GOAL_DEADLINE_DAYS = 7
+
+def get_alert_settings(db):
+    """Return the (budget threshold %, goal deadline days) configured in Settings"""
+    settings = db.get_notification_settings()
+    if settings.empty:
+        return DEFAULT_BUDGET_THRESHOLD, DEFAULT_GOAL_DEADLINE_DAYS
+    row = settings.iloc[0]
+    threshold = row['budget_alert_threshold']
+    days = row['goal_deadline_alert_days']
+    return (
+        DEFAULT_BUDGET_THRESHOLD if pd.isna(threshold) else float(threshold),
+        DEFAULT_GOAL_DEADLINE_DAYS if pd.isna(days) else int(days),
+    )
+
+def check_budget_alerts(db, threshold=None):
     """Check for budget overages and return alerts"""
     budget_goals = db.get_budget_goals()
-    transactions = db.get_transactions()
+    if budget_goals.empty:
+        return []
+    if threshold is None:
+        threshold, _ = get_alert_settings(db)
+
+    current_month = datetime.now().strftime("%Y-%m")
+    monthly_expenses = db.get_monthly_totals(
+        start_month=current_month,
+        end_month=current_month,
+        types=['Expense'],
+        categories=budget_goals['category'].tolist()
+    )[['category', 'total']]
+
+    budgets = budget_goals.merge(monthly_expenses, on='category', how='left')
+    budgets['actual'] = budgets['total'].fillna(0)
+    budgets['percentage'] = np.where(
+        budgets['amount'] > 0, budgets['actual'] / budgets['amount'].where(budgets['amount'] > 0) * 100, 0
+    )
+
+    # Notice from the threshold, warning halfway to the limit, over budget at 100%
+    warning = threshold + (100 - threshold) / 2 if threshold < 100 else threshold
+    pct = budgets['percentage']
+    budgets['severity'] = np.select(
+        [pct >= max(threshold, 100), pct >= warning, pct >= threshold], ['high', 'medium', 'low'], default=''
+    )
+
     alerts = []
-    
-    if not budget_goals.empty and not transactions.empty:
-        current_month = datetime.now().strftime("%Y-%m")
-        monthly_expenses = transactions[
-            (transactions['type'] == 'Expense') &
-            (transactions['date'].dt.strftime("%Y-%m") == current_month)
-        ].groupby('category')['amount'].sum()
-        
-        for _, row in budget_goals.iterrows():
-            actual = monthly_expenses.get(row['category'], 0)
-            percentage = (actual / row['amount'] * 100) if row['amount'] > 0 else 0
-            
-            # Alert at 80%, 90% and over 100%
-            if percentage >= 100:
-                alerts.append({
-                    'category': row['category'],
-                    'severity': 'high',
-                    'message': f"🚨 OVER BUDGET: {row['category']} (${actual:.2f} / ${row['amount']:.2f})",
-                    'percentage': percentage
-                })
-            elif percentage >= 90:
-                alerts.append({
-                    'category': row['category'],
-                    'severity': 'medium',
-                    'message': f"⚠️ WARNING: {row['category']} at {percentage:.1f}% of budget",
-                    'percentage': percentage
-                })
-            elif percentage >= 80:
-                alerts.append({
-                    'category': row['category'],
-                    'severity': 'low',
-                    'message': f"ℹ️ NOTICE: {row['category']} at {percentage:.1f}% of budget",
-                    'percentage': percentage
-                })
-    
+    for row in budgets[budgets['severity'] != ''].to_dict('records'):
+        if row['severity'] == 'high':
+            message = f"🚨 OVER BUDGET: {row['category']} (${row['actual']:.2f} / ${row['amount']:.2f})"
+        elif row['severity'] == 'medium':
+            message = f"⚠️ WARNING: {row['category']} at {row['percentage']:.1f}% of budget"
+        else:
+            message = f"ℹ️ NOTICE: {row['category']} at {row['percentage']:.1f}% of budget"
+        alerts.append({
+            'category': row['category'],
+            'severity': row['severity'],
+            'message': message,
+            'percentage': row['percentage']
+        })
     return alerts
 
+@profiled
 def render_alerts(alerts):
     """Render alerts in the UI"""
     if not alerts:
@@ -66,44 +88,52 @@ def render_alerts(alerts):
         else:
             st.markdown(f'<div class="stAlert alert-info">{alert["message"]}</div>', unsafe_allow_html=True)
 
-def check_financial_goal_alerts(db):
+def check_financial_goal_alerts(db, deadline_days=None):
     """Check for financial goals deadline alerts"""
     financial_goals = db.get_financial_goals()
+    if financial_goals.empty:
+        return []
+    if deadline_days is None:
+        _, deadline_days = get_alert_settings(db)
+
+    now = pd.Timestamp.now()
+    target_date = pd.to_datetime(financial_goals['target_date'], errors='coerce')
+    created_at = pd.to_datetime(financial_goals['created_at'], errors='coerce')
+    goals = pd.DataFrame({
+        'name': financial_goals['name'],
+        'days_left': (target_date - now).dt.days,
+        'progress': financial_goals['current_amount'].fillna(0)
+                    / financial_goals['target_amount'].where(financial_goals['target_amount'] != 0) * 100,
+        'time_elapsed': (now - created_at).dt.days,
+        'total_time': (target_date - created_at).dt.days,
+    })
+    goals['expected_progress'] = goals['time_elapsed'] / goals['total_time'].where(goals['total_time'] > 0) * 100
+    goals['approaching'] = (goals['days_left'] <= deadline_days) & (goals['days_left'] > 0)
+    goals['overdue'] = goals['days_left'] <= 0
+    goals['slow'] = (goals['progress'] < goals['expected_progress'] * 0.7) & (goals['time_elapsed'] > 30)
+
     alerts = []
-    
-    if not financial_goals.empty:
-        for _, goal in financial_goals.iterrows():
-            days_left = (pd.to_datetime(goal['target_date']) - pd.Timestamp.now()).days
-            progress = (goal['current_amount'] / goal['target_amount']) * 100
-            
-            # Alert for goals approaching deadline
-            if days_left <= 7 and days_left > 0:
-                alerts.append({
-                    'name': goal['name'],
-                    'severity': 'medium',
-                    'message': f"⏰ DEADLINE APPROACHING: {goal['name']} due in {days_left} days ({progress:.1f}% complete)",
-                    'days_left': days_left
-                })
-            elif days_left <= 0:
-                alerts.append({
-                    'name': goal['name'],
-                    'severity': 'high',
-                    'message': f"⚠️ DEADLINE PASSED: {goal['name']} is overdue ({progress:.1f}% complete)",
-                    'days_left': days_left
-                })
-            
-            # Alert for goals with slow progress
-            time_elapsed = (pd.Timestamp.now() - pd.to_datetime(goal['created_at'])).days
-            total_time = (pd.to_datetime(goal['target_date']) - pd.to_datetime(goal['created_at'])).days
-            
-            if total_time > 0:
-                expected_progress = (time_elapsed / total_time) * 100
-                if progress < (expected_progress * 0.7) and time_elapsed > 30:
-                    alerts.append({
-                        'name': goal['name'],
-                        'severity': 'medium',
-                        'message': f"📉 SLOW PROGRESS: {goal['name']} is behind schedule ({progress:.1f}% vs expected {expected_progress:.1f}%)",
-                        'progress_gap': expected_progress - progress
-                    })
-    
+    for goal in goals[goals['approaching'] | goals['overdue'] | goals['slow']].to_dict('records'):
+        days_left = int(goal['days_left'])
+        if goal['approaching']:
+            alerts.append({
+                'name': goal['name'],
+                'severity': 'medium',
+                'message': f"⏰ DEADLINE APPROACHING: {goal['name']} due in {days_left} days ({goal['progress']:.1f}% complete)",
+                'days_left': days_left
+            })
+        elif goal['overdue']:
+            alerts.append({
+                'name': goal['name'],
+                'severity': 'high',
+                'message': f"⚠️ DEADLINE PASSED: {goal['name']} is overdue ({goal['progress']:.1f}% complete)",
+                'days_left': days_left
+            })
+        if goal['slow']:
+            alerts.append({
+                'name': goal['name'],
+                'severity': 'medium',
+                'message': f"📉 SLOW PROGRESS: {goal['name']} is behind schedule ({goal['progress']:.1f}% vs expected {goal['expected_progress']:.1f}%)",
+                'progress_gap': goal['expected_progress'] - goal['progress']
+            })
     return alerts
@@ -0,0 +1,208 @@
+"""Lightweight call profiling for Database methods and page renderers.
+
+Profiling is off by default, and a profiled call then costs one attribute
+check. When it is on, every call records its wall time, its own time
+(excluding the profiled calls it made, so a renderer's own time is its pandas
+and Plotly work and the queries show up under Database), and the rows and
+bytes of any DataFrame it returned. A result passed up unchanged from a
+profiled call is only counted by the call that made it, and measuring it is
+left out of every call's own time. Generators are measured as they are
+consumed. Stats are shared by every session in the process.
+
+Set REALITY_TRACKER_PROFILE=1 to profile from startup, or =json to also log
+each call as one JSON line on stderr.
+"""
+import functools
+import inspect
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+# Recent durations kept per name for the p95
+SAMPLE_SIZE = 1000
+
+REPORT_COLUMNS = ['name', 'calls', 'errors', 'total_ms', 'own_ms', 'mean_ms', 'p95_ms', 'max_ms', 'rows', 'bytes']
+
+logger = logging.getLogger('reality_tracker.profiling')
+
+
+def _result_size(result):
+    """Rows and deep bytes of a DataFrame or Series result, or of the first one in a tuple"""
+    if isinstance(result, tuple):
+        result = next((item for item in result if isinstance(item, (pd.DataFrame, pd.Series))), None)
+    if isinstance(result, pd.DataFrame):
+        return len(result), int(result.memory_usage(index=True, deep=True).sum())
+    if isinstance(result, pd.Series):
+        return len(result), int(result.memory_usage(index=True, deep=True))
+    if isinstance(result, list):
+        return len(result), 0
+    return 0, 0
+
+
+class Profiler:
+    def __init__(self, enabled=False, log_json=False):
+        self.enabled = False
+        self.log_json = False
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.configure(enabled, log_json)
+
+    def configure(self, enabled=None, log_json=None):
+        """Turn profiling and JSON logging on or off"""
+        if enabled is not None:
+            self.enabled = enabled
+        if log_json is not None:
+            self.log_json = log_json
+            if log_json and not logger.handlers:
+                handler = logging.StreamHandler(sys.stderr)
+                handler.setFormatter(logging.Formatter('%(message)s'))
+                logger.addHandler(handler)
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+    def _stack(self):
+        """Per-thread stack of [seconds in profiled calls, results they returned] for each active call"""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _timed(self, func, *args, **kwargs):
+        """Run func, returning its result, its wall and own seconds, and the results of its profiled calls"""
+        stack = self._stack()
+        frame = [0.0, []]
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            if stack:
+                stack[-1][0] += elapsed
+        return result, elapsed, elapsed - frame[0], frame[1]
+
+    def _measure(self, result, child_results):
+        """Rows and bytes of a result, or zeros when a profiled call made by this one already counted it"""
+        size = (0, 0)
+        stack = self._stack()
+        if not any(result is child for child in child_results):
+            start = time.perf_counter()
+            size = _result_size(result)
+            if stack:
+                # Measuring is profiling overhead, not part of the caller's own time
+                stack[-1][0] += time.perf_counter() - start
+        if stack:
+            stack[-1][1].append(result)
+        return size
+
+    def call(self, name, func, args, kwargs):
+        """Call func and record it under name"""
+        try:
+            result, elapsed, own, child_results = self._timed(func, *args, **kwargs)
+        except Exception:
+            self.record(name, failed=True)
+            raise
+        if inspect.isgenerator(result):
+            return self._iterate(name, result)
+        self.record(name, elapsed, own, *self._measure(result, child_results))
+        return result
+
+    def _iterate(self, name, generator):
+        """Pass a generator through, recording it as one call once it is exhausted or closed"""
+        elapsed = own = 0.0
+        rows = nbytes = 0
+        try:
+            while True:
+                try:
+                    item, seconds, own_seconds, child_results = self._timed(next, generator)
+                except StopIteration:
+                    return
+                elapsed += seconds
+                own += own_seconds
+                item_rows, item_bytes = self._measure(item, child_results)
+                rows += item_rows
+                nbytes += item_bytes
+                yield item
+        finally:
+            generator.close()
+            self.record(name, elapsed, own, rows, nbytes)
+
+    def record(self, name, elapsed=0.0, own=0.0, rows=0, nbytes=0, failed=False):
+        """Add one call to the stats for name; failed calls are only counted"""
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = {
+                    'calls': 0, 'errors': 0, 'total': 0.0, 'own': 0.0, 'max': 0.0, 'rows': 0, 'bytes': 0,
+                    'samples': deque(maxlen=SAMPLE_SIZE),
+                }
+            if failed:
+                stats['errors'] += 1
+            else:
+                stats['calls'] += 1
+                stats['total'] += elapsed
+                stats['own'] += own
+                stats['max'] = max(stats['max'], elapsed)
+                stats['rows'] += rows
+                stats['bytes'] += nbytes
+                stats['samples'].append(elapsed)
+        if self.log_json:
+            logger.info(json.dumps({
+                'event': 'profile', 'name': name, 'seconds': round(elapsed, 6), 'own_seconds': round(own, 6),
+                'rows': rows, 'bytes': nbytes, 'failed': failed,
+            }))
+
+    def report(self):
+        """One row per profiled name, slowest total first"""
+        with self._lock:
+            snapshot = [(name, dict(stats, samples=list(stats['samples']))) for name, stats in self._stats.items()]
+        rows = [{
+            'name': name,
+            'calls': stats['calls'],
+            'errors': stats['errors'],
+            'total_ms': stats['total'] * 1000,
+            'own_ms': stats['own'] * 1000,
+            'mean_ms': stats['total'] * 1000 / stats['calls'] if stats['calls'] else 0.0,
+            'p95_ms': float(np.percentile(stats['samples'], 95)) * 1000 if stats['samples'] else 0.0,
+            'max_ms': stats['max'] * 1000,
+            'rows': stats['rows'],
+            'bytes': stats['bytes'],
+        } for name, stats in snapshot]
+        return pd.DataFrame(rows, columns=REPORT_COLUMNS).sort_values('total_ms', ascending=False, ignore_index=True)
+
+
+_setting = os.environ.get('REALITY_TRACKER_PROFILE', '').lower()
+PROFILER = Profiler(enabled=_setting not in ('', '0', 'false'), log_json=_setting == 'json')
+
+
+def profiled(func):
+    """Decorator recording calls to func in PROFILER while it is enabled"""
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not PROFILER.enabled:
+            return func(*args, **kwargs)
+        return PROFILER.call(name, func, args, kwargs)
+    return wrapper
+
+
+def profile_methods(cls):
+    """Class decorator profiling every public method"""
+    for attr, value in list(vars(cls).items()):
+        if inspect.isfunction(value) and not attr.startswith('_'):
+            setattr(cls, attr, profiled(value))
+    return cls
@@ -1,7 +1,9 @@
 import streamlit as st
-import plotly.express as px
 import pandas as pd
 from datetime import datetime, timedelta
+from components.aggregation import bucket_totals
+from components.chart_data import line_trace, reduction_note
+from components.profiling import profiled
 
 def validate_date_range(start_date, end_date):
     if start_date > end_date:
@@ -12,12 +14,12 @@ def validate_date_range(start_date, end_date):
         return False
     return True
 
+@profiled
 def render_reports(db):
     st.title("Financial Reports")
 
-    transactions = db.get_transactions()
-    if not transactions.empty:
-        transactions['date'] = pd.to_datetime(transactions['date'])
+    first_date, _ = db.get_transaction_date_range()
+    if first_date is not None:
         # Time Period Selection
         period = st.selectbox(
             "Select Time Period",
@@ -35,30 +37,34 @@ def render_reports(db):
         elif period == "Year to Date":
             start_date = datetime(end_date.year, 1, 1)
         else:
-            start_date = transactions['date'].min()
+            start_date = first_date
 
-        filtered_data = transactions[
-            (transactions['date'] >= pd.Timestamp(start_date)) &
-            (transactions['date'] <= pd.Timestamp(end_date))
-        ]
+        filtered_data = db.query_transactions(
+            start_date=start_date,
+            end_date=end_date,
+            columns=['date', 'type', 'category', 'amount']
+        )
 
         if not filtered_data.empty:
+            import plotly.express as px
+            import plotly.graph_objects as go
+
             # Spending Patterns
             st.subheader("Spending Patterns")
             expenses = filtered_data[filtered_data['type'] == 'Expense']
 
             if not expenses.empty:
-                # Daily spending trend
-                daily_expenses = expenses.groupby('date')['amount'].sum().reset_index()
-                fig = px.line(
-                    daily_expenses,
-                    x='date',
-                    y='amount',
-                    title='Daily Spending Trend',
-                    line_shape='spline'
-                )
-                fig.update_traces(line_color='#2E7D32')
+                # Daily spending trend over the whole period, so days without spending count as zero
+                daily_totals = bucket_totals(expenses['date'], expenses['amount'], 'day',
+                                             start=start_date, end=end_date)
+                daily_expenses = daily_totals.rename('amount').rename_axis('date').to_timestamp().reset_index()
+                trace = line_trace(daily_totals, 'amount', spline=True, line=dict(color='#2E7D32'))
+                fig = go.Figure(trace)
+                fig.update_layout(title='Daily Spending Trend', xaxis_title='date', yaxis_title='amount')
                 st.plotly_chart(fig, use_container_width=True)
+                note = reduction_note(len(daily_totals), len(trace.x))
+                if note:
+                    st.caption(note)
 
                 # Category breakdown
                 category_expenses = expenses.groupby('category')['amount'].sum().reset_index()
@@ -2,22 +2,27 @@
 import streamlit as st
 import numpy as np
 import pandas as pd
-import plotly.express as px
 from datetime import datetime, timedelta
+from components.finance_math import COMPOUNDING, balance_timeline, payment, payment_grid, periodic_rate
+from components.monte_carlo import simulate_savings
+from components.profiling import profiled
 
-def calculate_monthly_savings(target_amount, current_savings, months, interest_rate):
+# Time frames compared against the chosen one, as multiples of it
+SCENARIO_HORIZONS = [0.5, 0.75, 1, 1.5, 2]
+# Interest rates compared against the chosen one, in percentage points
+SCENARIO_RATE_STEPS = [-2, -1, 0, 1, 2]
+# Path counts offered for Monte Carlo projections
+SIMULATION_SIZES = [1_000, 10_000, 50_000, 100_000]
+
+def calculate_monthly_savings(target_amount, current_savings, months, interest_rate, compounding=12, when='end'):
     """Calculate required monthly savings to reach goal"""
     if months <= 0 or target_amount <= current_savings:
         return 0
-    r = interest_rate / 100 / 12  # Monthly interest rate
-    if r == 0:
-        return (target_amount - current_savings) / months
-    try:
-        pmt = np.pmt(r, months, -current_savings, target_amount, when='end')
-        return 0 if np.isinf(pmt) or np.isnan(pmt) else float(pmt)
-    except:
-        return 0
+    rate = periodic_rate(interest_rate / 100, 12, compounding)
+    monthly = float(payment(rate, months, current_savings, target_amount, when))
+    return monthly if np.isfinite(monthly) and monthly > 0 else 0
 
+@profiled
 def render_savings_calculator():
     st.title("Savings Goal Calculator")
     
@@ -59,92 +64,183 @@ def render_savings_calculator():
     with col2:
         years = st.number_input("Time Frame (Years)", min_value=0.1, max_value=50.0, value=5.0, step=0.5)
         interest_rate = st.number_input("Annual Interest Rate (%)", min_value=0.0, max_value=30.0, value=5.0, step=0.1)
+
+    col3, col4 = st.columns(2)
+    with col3:
+        compounding_label = st.selectbox("Interest Compounding", list(COMPOUNDING), index=1)
+    with col4:
+        timing = st.radio("Monthly Contributions", ["End of month", "Start of month"], horizontal=True)
+    compounding = COMPOUNDING[compounding_label]
+    when = 'begin' if timing == "Start of month" else 'end'
+    monthly_rate = periodic_rate(interest_rate / 100, 12, compounding)
     
-    if st.button("Calculate Savings Plan", type="primary"):
-        if target_amount <= current_savings:
-            st.success("You have already reached your savings goal!")
-            return
+    plan_tab, simulation_tab = st.tabs(["Savings Plan", "Monte Carlo Projection"])
+    with simulation_tab:
+        render_monte_carlo(target_amount, current_savings, years, interest_rate, compounding, when)
+
+    with plan_tab:
+        if st.button("Calculate Savings Plan", type="primary"):
+            if target_amount <= current_savings:
+                st.success("You have already reached your savings goal!")
+                return
             
-        months = int(years * 12)
-        monthly_savings = calculate_monthly_savings(target_amount, current_savings, months, interest_rate)
+            months = int(years * 12)
+            monthly_savings = calculate_monthly_savings(target_amount, current_savings, months, interest_rate,
+                                                        compounding, when)
         
-        if target_amount <= 0:
-            st.error("Target amount must be greater than zero")
-            return
+            if target_amount <= 0:
+                st.error("Target amount must be greater than zero")
+                return
             
-        if years <= 0:
-            st.error("Time frame must be greater than zero")
-            return
+            if years <= 0:
+                st.error("Time frame must be greater than zero")
+                return
             
-        if monthly_savings <= 0:
-            st.warning(f"""
-            The calculation is not possible with these parameters. This could be because:
-            - The target amount (${target_amount:,.2f}) is too close to current savings (${current_savings:,.2f})
-            - The time frame ({years:.1f} years) is too short
-            - The interest rate ({interest_rate:.1f}%) is too high
+            if months > 0 and float(payment(monthly_rate, months, current_savings, target_amount, when)) <= 0:
+                st.success(f"Your current savings will grow to ${target_amount:,.2f} in {years:.1f} years "
+                           "without further contributions.")
+                return
+
+            if monthly_savings <= 0:
+                st.warning(f"""
+                The calculation is not possible with these parameters. This could be because:
+                - The target amount (${target_amount:,.2f}) is too close to current savings (${current_savings:,.2f})
+                - The time frame ({years:.1f} years) is too short
+                - The interest rate ({interest_rate:.1f}%) is too high
             
-            Try adjusting these values to make the calculation possible.
-            """)
-            return
+                Try adjusting these values to make the calculation possible.
+                """)
+                return
             
-        total_contributions = monthly_savings * months
-        interest_earned = target_amount - current_savings - total_contributions
+            total_contributions = monthly_savings * months
+            interest_earned = target_amount - current_savings - total_contributions
         
-        st.markdown("---")
+            st.markdown("---")
     
-        # Results display
-        col1, col2, col3 = st.columns(3)
+            # Results display
+            col1, col2, col3 = st.columns(3)
         
-        with col1:
-            st.metric("Required Monthly Savings", f"${monthly_savings:.2f}")
-        with col2:
-            st.metric("Total Contributions", f"${total_contributions:.2f}")
-        with col3:
-            st.metric("Interest Earned", f"${interest_earned:.2f}")
+            with col1:
+                st.metric("Required Monthly Savings", f"${monthly_savings:.2f}")
+            with col2:
+                st.metric("Total Contributions", f"${total_contributions:.2f}")
+            with col3:
+                st.metric("Interest Earned", f"${interest_earned:.2f}")
     
-        # Progress timeline
-        st.subheader("Savings Growth Timeline")
+            # Progress timeline
+            st.subheader("Savings Growth Timeline")
         
-        try:
-            timeline = []
-            balance = current_savings
-            
-            for month in range(months + 1):
-                if month <= months:  # Only plot within the specified timeframe
-                    timeline.append({
-                        'Month': month,
-                        'Balance': round(balance, 2)
-                    })
-                    interest = balance * (interest_rate / 100 / 12)
-                    balance = balance + interest + monthly_savings
+            try:
+                balances = balance_timeline(monthly_rate, months, current_savings, monthly_savings, when)
             
-            if timeline:
-                df = pd.DataFrame(timeline)
+                if len(balances):
+                    import plotly.express as px
+                    df = pd.DataFrame({'Month': np.arange(len(balances)), 'Balance': balances.round(2)})
                 
-                # Ensure values are finite
-                df['Balance'] = df['Balance'].clip(lower=0, upper=target_amount * 1.2)
+                    # Ensure values are finite
+                    df['Balance'] = df['Balance'].clip(lower=0, upper=target_amount * 1.2)
                 
-                fig = px.line(
-                    df,
-                    x='Month',
-                    y='Balance',
-                    title='Projected Savings Growth',
-                    labels={'Balance': 'Balance ($)', 'Month': 'Months'},
-                )
-                fig.update_layout(
-                    showlegend=False,
-                    yaxis=dict(
-                        range=[0, df['Balance'].max() * 1.1],
-                        tickformat='$,.0f'
-                    ),
-                    xaxis=dict(
-                        range=[0, months],
-                        tickmode='linear',
-                        dtick=max(1, months // 10)
-                    ),
-                    hovermode='x unified'
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                    fig = px.line(
+                        df,
+                        x='Month',
+                        y='Balance',
+                        title='Projected Savings Growth',
+                        labels={'Balance': 'Balance ($)', 'Month': 'Months'},
+                    )
+                    fig.update_layout(
+                        showlegend=False,
+                        yaxis=dict(
+                            range=[0, df['Balance'].max() * 1.1],
+                            tickformat='$,.0f'
+                        ),
+                        xaxis=dict(
+                            range=[0, months],
+                            tickmode='linear',
+                            dtick=max(1, months // 10)
+                        ),
+                        hovermode='x unified'
+                    )
+                    st.plotly_chart(fig, use_container_width=True)
                 
-        except Exception as e:
-            st.error(f"Unable to generate the savings growth timeline. Error: {str(e)}")
+            except Exception as e:
+                st.error(f"Unable to generate the savings growth timeline. Error: {str(e)}")
+
+            # What the same goal costs at nearby rates and time frames
+            with st.expander("Compare Interest Rates and Time Frames"):
+                rates = sorted({min(max(interest_rate + step, 0.0), 30.0) for step in SCENARIO_RATE_STEPS})
+                horizons = sorted({min(max(round(years * factor * 12), 1), 600) for factor in SCENARIO_HORIZONS})
+                grid = payment_grid(np.array(rates) / 100, np.array(horizons) / 12, current_savings, target_amount,
+                                    compounding=compounding, when=when).clip(lower=0)
+                grid.index = [f"{rate:.1f}%" for rate in rates]
+                grid.columns = [f"{m // 12} years" if m % 12 == 0 else f"{m} months" for m in horizons]
+                st.write("Monthly savings needed for the same target:")
+                st.dataframe(grid.style.format("${:,.2f}"), use_container_width=True)
+
+@profiled
+def render_monte_carlo(target_amount, current_savings, years, interest_rate, compounding, when):
+    st.write("Instead of one fixed interest rate, simulate many possible market paths with returns that "
+             "vary month to month around it. With 0% volatility every path matches the savings plan.")
+    months = int(years * 12)
+    planned = calculate_monthly_savings(target_amount, current_savings, months, interest_rate, compounding, when)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        # Rounded up to the cent so the default contribution still reaches the target
+        contribution = st.number_input("Monthly Contribution ($)", min_value=0.0,
+                                       value=float(np.ceil(planned * 100) / 100), step=50.0,
+                                       help="Starts at the amount the fixed-rate plan requires")
+        contribution_growth = st.number_input("Yearly Contribution Increase (%)", min_value=0.0, max_value=20.0,
+                                              value=0.0, step=0.5)
+    with col2:
+        mean_return = st.number_input("Expected Annual Return (%)", min_value=-10.0, max_value=30.0,
+                                      value=float(interest_rate), step=0.5)
+        volatility = st.number_input("Annual Volatility (%)", min_value=0.0, max_value=60.0, value=10.0, step=1.0,
+                                     help="Savings accounts: near 0%. Bond funds: 5%. Stock funds: 15-20%")
+    with col3:
+        inflation = st.number_input("Annual Inflation (%)", min_value=0.0, max_value=15.0, value=2.0, step=0.1,
+                                    help="Only used to show the final balances in today's dollars")
+        paths = st.selectbox("Simulated Paths", SIMULATION_SIZES, index=1, format_func="{:,}".format)
+    seed = st.number_input("Random Seed", min_value=0, value=42, step=1,
+                           help="The same seed and inputs always give the same projection")
+
+    if st.button("Run Simulation"):
+        if months < 1:
+            st.error("Time frame must be at least one month")
+            return
+        result = simulate_savings(
+            target_amount, current_savings, contribution, months,
+            mean_return=mean_return / 100, volatility=volatility / 100, inflation=inflation / 100,
+            contribution_growth=contribution_growth / 100, when=when, paths=paths, seed=int(seed),
+            compounding=compounding
+        )
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Chance of Reaching Target", f"{result['probability']:.0%}",
+                      help="Share of paths at or above the target at the end of the time frame")
+        with col2:
+            st.metric("Reached at Some Point", f"{result['probability_any']:.0%}",
+                      help="Share of paths that touched the target at any time before the deadline")
+        with col3:
+            st.metric("Median Final Balance", f"${result['final']['P50']:,.2f}",
+                      help=f"${result['final_real']['P50']:,.2f} in today's dollars")
+
+        import plotly.graph_objects as go
+        bands = result['bands']
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=bands.index, y=bands['P10'], name='P10', line=dict(color='#90CAF9')))
+        fig.add_trace(go.Scatter(x=bands.index, y=bands['P90'], name='P90', line=dict(color='#90CAF9'),
+                                 fill='tonexty', fillcolor='rgba(25, 118, 210, 0.15)'))
+        fig.add_trace(go.Scatter(x=bands.index, y=bands['P50'], name='Median', line=dict(color='#1976D2', width=2)))
+        fig.add_hline(y=target_amount, line_dash='dash', line_color='#2E7D32', annotation_text='Target')
+        fig.update_layout(
+            title='Projected Savings, 10th to 90th Percentile',
+            xaxis_title='Months',
+            yaxis=dict(title='Balance ($)', tickformat='$,.0f'),
+            hovermode='x unified'
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        real = result['final_real']
+        st.caption(f"{result['paths']:,} simulated paths. Final balance in today's dollars at "
+                   f"{inflation:g}% inflation: P10 ${real['P10']:,.0f}, P50 ${real['P50']:,.0f}, "
+                   f"P90 ${real['P90']:,.0f}.")
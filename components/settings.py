@@ -0,0 +1,111 @@
+import streamlit as st
+from database import frame_memory_report
+from components.profiling import PROFILER, profiled
+
+@profiled
+def render_settings(db):
+    st.title("Settings")
+
+    # Notification Settings
+    st.header("Notification Settings")
+
+    # Get current settings
+    settings = db.get_notification_settings()
+
+    if not settings.empty:
+        settings = settings.iloc[0]
+
+        with st.form("notification_settings"):
+            st.subheader("Budget Alerts")
+            budget_threshold = st.slider(
+                "Alert threshold (% of budget)",
+                min_value=50,
+                max_value=100,
+                value=int(settings['budget_alert_threshold']),
+                step=5,
+                help="You'll be notified when your spending reaches this percentage of your budget"
+            )
+
+            st.subheader("Goal Deadline Alerts")
+            goal_days = st.number_input(
+                "Days before deadline",
+                min_value=1,
+                max_value=30,
+                value=int(settings['goal_deadline_alert_days']),
+                help="You'll be notified when a goal deadline is this many days away"
+            )
+
+            st.subheader("Email Notifications")
+            email_enabled = st.checkbox(
+                "Enable email notifications",
+                value=bool(settings['email_notifications']),
+                help="Send alerts to your email (not implemented yet)"
+            )
+
+            email_address = st.text_input(
+                "Email address",
+                value=settings['email_address'] if settings['email_address'] else "",
+                disabled=not email_enabled
+            )
+
+            if st.form_submit_button("Save Settings"):
+                try:
+                    db.update_notification_settings(
+                        budget_threshold,
+                        goal_days,
+                        email_enabled,
+                        email_address if email_enabled else None
+                    )
+                    st.success("Settings saved successfully!")
+                except Exception as e:
+                    st.error(f"Error saving settings: {str(e)}")
+
+    # Maintenance
+    st.header("Maintenance")
+    st.write("Monthly totals behind the dashboard and budget alerts are updated automatically. "
+             "Rebuild them if they ever look out of sync with your transactions.")
+    if st.button("Rebuild Monthly Totals"):
+        try:
+            db.rebuild_monthly_totals()
+            st.success("Monthly totals rebuilt successfully!")
+        except Exception as e:
+            st.error(f"Error rebuilding monthly totals: {str(e)}")
+
+    st.write("Compare the memory the full transaction history takes in the standard and compact layouts.")
+    if st.button("Measure Memory Usage"):
+        standard = frame_memory_report(db.query_transactions())
+        compact = frame_memory_report(db.query_transactions(compact=True))
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown(f"**Standard:** {standard.loc['Total', 'bytes'] / 1e6:,.1f} MB")
+            st.dataframe(standard, use_container_width=True)
+        with col2:
+            st.markdown(f"**Compact:** {compact.loc['Total', 'bytes'] / 1e6:,.1f} MB")
+            st.dataframe(compact, use_container_width=True)
+
+    # Performance
+    st.header("Performance")
+    st.write("Profile database calls and page rendering to see where time goes. Own time leaves out "
+             "the profiled calls made inside, so a page's own time is its pandas and chart work and "
+             "its queries are listed under Database. Stats cover every session since the last reset.")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.toggle("Enable profiling", value=PROFILER.enabled, key="profiling_enabled",
+                  on_change=lambda: PROFILER.configure(enabled=st.session_state.profiling_enabled))
+    with col2:
+        st.toggle("Log calls as JSON", value=PROFILER.log_json, key="profiling_log_json",
+                  on_change=lambda: PROFILER.configure(log_json=st.session_state.profiling_log_json),
+                  help="Write one JSON line per profiled call to the server's stderr")
+
+    report = PROFILER.report()
+    if report.empty:
+        st.info("Nothing recorded yet. Enable profiling, then visit the pages you want to measure.")
+    else:
+        report['MB'] = report.pop('bytes') / 1e6
+        st.dataframe(report, use_container_width=True, hide_index=True, column_config={
+            column: st.column_config.NumberColumn(format="%.1f")
+            for column in ['total_ms', 'own_ms', 'mean_ms', 'p95_ms', 'max_ms', 'MB']
+        })
+    if st.button("Reset Profiling Stats"):
+        PROFILER.reset()
+        st.rerun()
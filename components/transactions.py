@@ -1,7 +1,12 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
+from components.aggregation import FREQUENCIES, bucket_totals
+from components.profiling import profiled
 
+HISTORY_PAGE_SIZES = [25, 50, 100, 250]
+
+@profiled
 def render_category_badge(icon, name, color):
     st.markdown(
         f"""
@@ -21,11 +26,12 @@ def render_category_badge(icon, name, color):
     )
 
 def get_filtered_categories(db, transaction_type):
-    categories = db.get_all_categories()
-    return categories[categories['type'] == transaction_type]
+    return db.get_category_registry().names_of_type(transaction_type)
 
+@profiled
 def render_transactions(db):
     st.title("Transaction Management")
+    categories = db.get_category_registry()
 
     # Initialize session state for transaction type
     if 'transaction_type' not in st.session_state:
@@ -52,13 +58,11 @@ def render_transactions(db):
             with col2:
                 amount = st.number_input("Amount", min_value=0.01, format="%.2f")
 
-                # Get all categories instead of filtering by transaction type
-                all_categories = db.get_all_categories()
-
+                # Offer all categories instead of filtering by transaction type
                 category = st.selectbox(
                     "Category",
-                    all_categories['name'].tolist(),
-                    format_func=lambda x: f"{all_categories[all_categories['name'] == x]['icon'].iloc[0]} {x}",
+                    categories.names,
+                    format_func=categories.label,
                     key="category_select"  # Static key
                 )
 
@@ -90,13 +94,11 @@ def render_transactions(db):
                 r_amount = st.number_input("Amount", min_value=0.01, format="%.2f", key="recurring_amount")
 
             with col2:
-                # Get all categories instead of filtering by type
-                all_categories = db.get_all_categories()
-
+                # Offer all categories instead of filtering by type
                 r_category = st.selectbox(
                     "Category",
-                    all_categories['name'].tolist(),
-                    format_func=lambda x: f"{all_categories[all_categories['name'] == x]['icon'].iloc[0]} {x}",
+                    categories.names,
+                    format_func=categories.label,
                     key="recurring_category"
                 )
                 frequency = st.selectbox("Frequency", ["Daily", "Weekly", "Monthly", "Yearly"])
@@ -123,6 +125,7 @@ def render_transactions(db):
                         end_date.strftime("%Y-%m-%d") if end_date else None,
                         r_tags.split(',') if r_tags else []
                     )
+                    db.generate_recurring_transactions()
                     st.success("Recurring transaction set up successfully!")
                 except Exception as e:
                     st.error(f"Error setting up recurring transaction: {str(e)}")
@@ -132,19 +135,15 @@ def render_transactions(db):
 
         # Display existing categories
         st.write("### Default Categories")
-        categories = db.get_all_categories() # Removed reliance on session state here.
-
         col1, col2 = st.columns(2)
         with col1:
             st.write("Income Categories")
-            income_categories = categories[categories['type'] == 'Income']
-            for _, cat in income_categories.iterrows():
+            for cat in categories.by_type['Income']:
                 render_category_badge(cat['icon'], cat['name'], cat['color'])
 
         with col2:
             st.write("Expense Categories")
-            expense_categories = categories[categories['type'] == 'Expense']
-            for _, cat in expense_categories.iterrows():
+            for cat in categories.by_type['Expense']:
                 render_category_badge(cat['icon'], cat['name'], cat['color'])
 
         # Add custom category form
@@ -165,8 +164,7 @@ def render_transactions(db):
                 if validate_category(cat_name, cat_type, cat_icon, cat_color, cat_description):
                     if db.add_custom_category(cat_name, cat_type, cat_icon, cat_color, cat_description):
                         st.success(f"Added new category: {cat_icon} {cat_name}")
-                        # Update session state categories - not needed here anymore
-                        st.experimental_rerun()
+                        st.rerun()
                     else:
                         st.error("Category already exists!")
 
@@ -176,11 +174,11 @@ def render_transactions(db):
 
     col1, col2, col3 = st.columns(3)
     with col1:
-        search_term = st.text_input("Search description or tags", "")
+        search_term = st.text_input("Search description or tags", "", help="Matches every word you type, including words that start with it")
     with col2:
         filter_type = st.multiselect("Filter by type", ["Income", "Expense"])
     with col3:
-        filter_category = st.multiselect("Filter by category", categories['name'].unique().tolist()) #Use db.get_all_categories() here
+        filter_category = st.multiselect("Filter by category", categories.names, format_func=categories.label)
 
     # Date range filter
     date_col1, date_col2 = st.columns(2)
@@ -189,26 +187,22 @@ def render_transactions(db):
     with date_col2:
         end_date = st.date_input("End date", datetime.now())
 
-    # Get and filter transactions
-    transactions = db.get_transactions()
-    if not transactions.empty:
-        # Apply filters
-        mask = (transactions['date'].dt.date >= start_date) & (transactions['date'].dt.date <= end_date)
-        if search_term:
-            mask &= (
-                transactions['description'].str.contains(search_term, case=False, na=False) |
-                transactions['tags'].apply(lambda x: any(search_term.lower() in tag.lower() for tag in x))
-            )
-        if filter_type:
-            mask &= transactions['type'].isin(filter_type)
-        if filter_category:
-            mask &= transactions['category'].isin(filter_category)
-
-        filtered_transactions = transactions[mask].sort_values('date', ascending=False)
+    # Get filtered transactions
+    first_date, _ = db.get_transaction_date_range()
+    if first_date is not None:
+        filters = dict(
+            start_date=start_date,
+            end_date=end_date,
+            types=filter_type,
+            categories=filter_category,
+            search=search_term
+        )
 
-        # Display transaction stats
-        total_income = filtered_transactions[filtered_transactions['type'] == 'Income']['amount'].sum()
-        total_expenses = filtered_transactions[filtered_transactions['type'] == 'Expense']['amount'].sum()
+        # Display transaction stats, aggregated over every matching row in SQLite
+        type_totals = db.get_transaction_totals('type', **filters).set_index('type')
+        total_income = type_totals['amount'].get('Income', 0)
+        total_expenses = type_totals['amount'].get('Expense', 0)
+        total_count = int(type_totals['count'].sum())
 
         stats_col1, stats_col2, stats_col3 = st.columns(3)
         with stats_col1:
@@ -218,13 +212,38 @@ def render_transactions(db):
         with stats_col3:
             st.metric("Net Amount", f"${total_income - total_expenses:,.2f}")
 
-        # Display transactions with formatting
+        # Start from the first page whenever the filters change
+        page_size = st.selectbox("Rows per page", HISTORY_PAGE_SIZES, index=1)
+        signature = (repr(filters), page_size)
+        if st.session_state.get('history_filters') != signature:
+            st.session_state.history_filters = signature
+            st.session_state.history_cursor = {}
+            st.session_state.history_page = 1
+
+        page, has_previous, has_next = db.page_transactions(
+            page_size,
+            columns=['id', 'date', 'type', 'category', 'amount', 'description'],
+            compact=True,
+            **st.session_state.history_cursor,
+            **filters
+        )
+        if not has_previous:
+            st.session_state.history_page = 1
+
+        # Display transactions with formatting, only for the rows on this page
         def style_type(val):
             return 'color: green' if val == 'Income' else 'color: red'
 
-        styled_df = filtered_transactions[['date', 'type', 'category', 'amount', 'description', 'tags']].copy()
-        styled_df['amount'] = styled_df['amount'].apply(lambda x: f"${x:,.2f}")
-        styled_df['tags'] = styled_df['tags'].apply(lambda x: ', '.join(x) if x else '')
+        # Tags are kept out of the compact frame and only loaded for the rows shown
+        tags = db.get_transaction_tags(page['id'])
+        styled_df = pd.DataFrame({
+            'date': page['date'],
+            'type': page['type'],
+            'category': page['category'],
+            'amount': (page['amount_cents'] / 100).map(lambda x: f"${x:,.2f}"),
+            'description': page['description'],
+            'tags': tags.map(lambda x: ', '.join(x) if x else '').to_numpy(),
+        })
 
         st.dataframe(
             styled_df.style.map(style_type, subset=['type']),
@@ -232,12 +251,29 @@ def render_transactions(db):
             hide_index=True
         )
 
+        nav_col1, nav_col2, nav_col3 = st.columns([1, 2, 1])
+        with nav_col1:
+            st.button("← Newer", disabled=not has_previous, on_click=_move_history_page,
+                      args=('before', page, -1))
+        with nav_col2:
+            first_row = (st.session_state.history_page - 1) * page_size + 1 if len(page) else 0
+            st.caption(f"Page {st.session_state.history_page} · rows {first_row:,}–"
+                       f"{first_row + len(page) - 1 if len(page) else 0:,} of {total_count:,}")
+        with nav_col3:
+            st.button("Older →", disabled=not has_next, on_click=_move_history_page,
+                      args=('after', page, 1))
+
         # Export functionality
         if st.button("Export to CSV"):
-            csv = filtered_transactions.to_csv(index=False)
+            export = db.query_transactions(
+                columns=['date', 'type', 'category', 'amount', 'description', 'tags'],
+                order_by='date',
+                ascending=False,
+                **filters
+            )
             st.download_button(
                 label="Download CSV",
-                data=csv,
+                data=export.to_csv(index=False),
                 file_name=f"transactions_{datetime.now().strftime('%Y%m%d')}.csv",
                 mime="text/csv"
             )
@@ -247,7 +283,7 @@ def render_transactions(db):
         stat_tab1, stat_tab2 = st.tabs(["Category Analysis", "Time Analysis"])
 
         with stat_tab1:
-            cat_data = filtered_transactions.groupby('category')['amount'].agg(['sum', 'count']).reset_index()
+            cat_data = db.get_transaction_totals('category', **filters)
             cat_data.columns = ['Category', 'Total Amount', 'Number of Transactions']
             st.dataframe(
                 cat_data.style.format({'Total Amount': '${:,.2f}'}),
@@ -256,11 +292,20 @@ def render_transactions(db):
             )
 
         with stat_tab2:
-            time_data = filtered_transactions.groupby(filtered_transactions['date'].dt.strftime('%Y-%m'))['amount'].sum()
-            st.line_chart(time_data)
+            bucket = st.selectbox("Group by", list(FREQUENCIES), index=2, format_func=str.title)
+            daily = db.get_transaction_totals('date', **filters)
+            time_data = bucket_totals(daily['date'], daily['amount'], bucket)
+            st.line_chart(time_data.set_axis(time_data.index.to_timestamp()))
     else:
         st.info("No transactions recorded yet.")
 
+def _move_history_page(direction, page, step):
+    """Button callback moving the history table one page from the rows currently shown"""
+    row = 0 if direction == 'before' else -1
+    if len(page):
+        st.session_state.history_cursor = {direction: (page['date'].iloc[row], int(page['id'].iloc[row]))}
+        st.session_state.history_page = max(st.session_state.history_page + step, 1)
+
 def validate_category(name, type, icon, color, description):
     if not name.strip():
         st.error("Category name cannot be empty")
@@ -271,4 +316,4 @@ def validate_category(name, type, icon, color, description):
     if len(name) > 50:
         st.error("Category name is too long (maximum 50 characters)")
         return False
-    return Truerue
\ No newline at end of file
+    return True
@@ -1,106 +1,908 @@
 import sqlite3
+import numpy as np
 import pandas as pd
 from datetime import datetime
 import json
+import logging
+import re
+import copy
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from components.profiling import profile_methods, profiled
 
+logger = logging.getLogger('reality_tracker.database')
+
+try:
+    import pyarrow  # noqa: F401
+    COMPACT_STRING_DTYPE = pd.StringDtype('pyarrow')
+except ImportError:
+    COMPACT_STRING_DTYPE = pd.StringDtype()
+
+# Bump whenever migrate_database changes (tables, columns, INDEXES or versioned steps);
+# databases already at this version skip migration entirely
+SCHEMA_VERSION = 6
+
+# Secondary indexes managed by migrate_database. Give an index a new name when
+# its definition changes so existing databases pick it up.
+INDEXES = {
+    'idx_transactions_day': 'CREATE INDEX idx_transactions_day ON transactions (day)',
+    'idx_transactions_type_category_day':
+        'CREATE INDEX idx_transactions_type_category_day ON transactions (type, category, day)',
+    # Also makes recurring generation idempotent: one row per schedule and day
+    'idx_transactions_recurring_day':
+        'CREATE UNIQUE INDEX idx_transactions_recurring_day ON transactions (recurring_id, day) '
+        'WHERE recurring_id IS NOT NULL',
+    'idx_transaction_tags_tag':
+        'CREATE INDEX idx_transaction_tags_tag ON transaction_tags (tag, transaction_id)',
+    'idx_budget_goals_category_period':
+        'CREATE UNIQUE INDEX idx_budget_goals_category_period ON budget_goals (category, period)',
+}
+
+TRANSACTIONS_TABLE_SQL = '''
+CREATE TABLE IF NOT EXISTS {name} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    day INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    category TEXT NOT NULL,
+    amount_cents INTEGER NOT NULL,
+    description TEXT,
+    tags TEXT DEFAULT '[]',
+    recurring_id INTEGER,
+    FOREIGN KEY (recurring_id) REFERENCES recurring_transactions(id)
+)'''
+
+CATEGORY_COLUMNS = ('name', 'type', 'icon', 'color')
+TRANSACTION_COLUMNS = ('id', 'date', 'type', 'category', 'amount', 'description', 'tags', 'recurring_id')
+
+# Transactions store the date as whole days since 1970-01-01 and the amount in
+# integer cents. These map the public column names onto the stored ones, either
+# raw for building frames or converted back for text output and the view.
+STORED_COLUMNS = {'date': '{prefix}day', 'amount': '{prefix}amount_cents'}
+DISPLAY_COLUMNS = {
+    'date': "date({prefix}day * 86400, 'unixepoch')",
+    'amount': '{prefix}amount_cents / 100.0',
+}
+
+
+def _day_key(value):
+    """Days since 1970-01-01 of a date-like value, the way transaction dates are stored.
+
+    Timezone-aware values keep their wall-clock date rather than the UTC one.
+    """
+    value = pd.Timestamp(value)
+    if value.tzinfo:
+        value = value.tz_localize(None)
+    return int((value.normalize() - pd.Timestamp('1970-01-01')).days)
+
+
+def _days_since_epoch(dates):
+    """Vectorized _day_key for a datetime Series"""
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    return dates.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]').astype(np.int64)
+
+
+def _parse_date(value):
+    """One date in any format pandas reads, as a naive Timestamp keeping its wall-clock date, or NaT"""
+    try:
+        date = pd.to_datetime(value, format='mixed') if isinstance(value, str) else pd.Timestamp(value)
+    except (ValueError, TypeError, OverflowError):
+        return pd.NaT
+    return date.tz_localize(None) if date is not pd.NaT and date.tzinfo else date
+
+
+def _parse_legacy_dates(values):
+    """Datetimes for dates stored as text by older versions, NaT where a value can't be read"""
+    text = values.astype(object).where(values.notna(), None)
+    dates = pd.to_datetime(text.str[:10], format='%Y-%m-%d', errors='coerce')
+    # Anything that isn't ISO, such as '03/09/2025', is parsed one value at a time
+    retry = dates.isna() & text.notna()
+    dates[retry] = text[retry].astype(str).map(_parse_date)
+    return dates.dt.normalize()
+
+
+def _to_cents(amounts):
+    """Round float amounts to integer cents"""
+    return np.rint(np.asarray(amounts, dtype=float) * 100).astype(np.int64)
+
+
+def _select_columns(columns, mapping, table=None):
+    """SELECT list for public transaction columns using the given stored-column mapping"""
+    prefix = f'{table}.' if table else ''
+    return ', '.join(
+        f'{mapping[column].format(prefix=prefix)} AS {column}' if column in mapping else f'{prefix}{column}'
+        for column in columns
+    )
+
+
+def _fts_tags_sql(row):
+    """SQL expression turning a row's JSON tags into space-separated words for the search index"""
+    return (f"(SELECT group_concat(value, ' ') FROM json_each("
+            f"CASE WHEN json_valid({row}.tags) THEN {row}.tags ELSE '[]' END))")
+
+
+def _fts_query(text):
+    """Turn free text into an FTS5 query that matches every word as a prefix"""
+    words = re.findall(r'\w+', text)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def _decode_transactions(df):
+    """Convert the stored tags, day and cents columns of a transactions frame"""
+    if 'tags' in df.columns:
+        # Convert tags from JSON string to list
+        df['tags'] = df['tags'].apply(lambda x: json.loads(x) if x else [])
+    if 'date' in df.columns:
+        # Whole days convert straight to datetimes without any string parsing
+        df['date'] = pd.to_datetime(df['date'].astype(np.int64), unit='D')
+    if 'amount' in df.columns:
+        df['amount'] = df['amount'].astype(np.int64) / 100
+    return df
+
+
+def _compact_transactions(df):
+    """Shrink a transactions frame: categorical labels, integer cents, Arrow-backed text.
+
+    Tags are left out; fetch them for the rows you show with get_transaction_tags.
+    """
+    df = df.drop(columns=['tags'], errors='ignore')
+    for column in ('type', 'category'):
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+    if 'amount' in df.columns:
+        df.insert(df.columns.get_loc('amount'), 'amount_cents', df.pop('amount').astype(np.int64))
+    if 'description' in df.columns:
+        df['description'] = df['description'].astype(COMPACT_STRING_DTYPE)
+    if 'recurring_id' in df.columns:
+        df['recurring_id'] = df['recurring_id'].astype('Int64')
+    if 'date' in df.columns:
+        df['date'] = pd.to_datetime(df['date'].astype(np.int64), unit='D')
+    return df
+
+
+def frame_memory_report(df):
+    """Bytes used by each column of a frame, deep-counting Python objects, plus a total row"""
+    usage = df.memory_usage(index=True, deep=True)
+    report = pd.DataFrame({
+        'dtype': [str(df.index.dtype)] + [str(dtype) for dtype in df.dtypes],
+        'bytes': usage.to_numpy(),
+    }, index=usage.index)
+    report.loc['Total'] = ['', int(usage.sum())]
+    report['bytes_per_row'] = report['bytes'] / max(len(df), 1)
+    return report
+
+def _parse_tags(value):
+    """Coerce a tags cell from an imported file into a list of strings"""
+    if isinstance(value, (list, tuple)):
+        return [str(tag).strip() for tag in value if str(tag).strip()]
+    if value is None or (pd.api.types.is_scalar(value) and pd.isna(value)):
+        return []
+    text = str(value).strip()
+    try:
+        parsed = json.loads(text)
+        if isinstance(parsed, list):
+            return [str(tag).strip() for tag in parsed if str(tag).strip()]
+    except ValueError:
+        pass
+    # Fall back to comma-separated text, including Python list reprs like "['a', 'b']"
+    tags = (tag.strip().strip('\'"').strip() for tag in text.strip('[]').split(','))
+    return [tag for tag in tags if tag]
+
+
+def _prepare_transactions(data):
+    """Validate and coerce whole columns of imported transactions.
+
+    Returns the insertable rows (keyed by the original index) and a list of
+    {'row', 'column', 'error'} dicts for the rows that were rejected.
+    """
+    missing = [col for col in ('date', 'type', 'category', 'amount') if col not in data.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+    invalid = pd.Series('', index=data.index)
+    invalid_column = pd.Series('', index=data.index)
+
+    def reject(mask, column, message):
+        mask = mask.fillna(False).astype(bool) & (invalid == '')
+        invalid[mask] = message
+        invalid_column[mask] = column
+
+    # Parse dates with the inferred format first and only fall back to per-value
+    # parsing for the rows that did not match it, or for the whole column when it
+    # mixes timezones. Timezones are dropped, keeping each row's wall-clock date.
+    try:
+        dates = pd.to_datetime(data['date'], errors='coerce')
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_localize(None)
+    except (ValueError, TypeError):
+        dates = pd.Series(pd.NaT, index=data.index, dtype='datetime64[ns]')
+    retry = dates.isna() & data['date'].notna()
+    if retry.any():
+        dates[retry] = data.loc[retry, 'date'].map(_parse_date)
+    reject(dates.isna(), 'date', 'Invalid or missing date')
+
+    types = data['type'].astype('string').str.strip().str.title()
+    reject(~types.isin(['Income', 'Expense']), 'type', "Type must be 'Income' or 'Expense'")
+
+    categories = data['category'].astype('string').str.strip()
+    reject(categories.fillna('') == '', 'category', 'Missing category')
+
+    amounts = pd.to_numeric(data['amount'], errors='coerce')
+    reject(amounts.isna() | ~np.isfinite(amounts.fillna(0)), 'amount', 'Amount must be a number')
+
+    descriptions = data['description'].astype('string').fillna('') if 'description' in data.columns \
+        else pd.Series('', index=data.index)
+    tags = data['tags'].map(_parse_tags) if 'tags' in data.columns else pd.Series([[]] * len(data), index=data.index)
+
+    valid = invalid == ''
+    rows = pd.DataFrame({
+        'day': _days_since_epoch(dates[valid]),
+        'type': types[valid].astype(object),
+        'category': categories[valid].astype(object),
+        'amount_cents': _to_cents(amounts[valid]),
+        'description': descriptions[valid].astype(object),
+        'tags': tags[valid].map(json.dumps),
+    })
+    errors = [
+        {'row': label, 'column': invalid_column[label], 'error': invalid[label]}
+        for label in data.index[~valid]
+    ]
+    return rows, errors
+
+
+# Step between occurrences of a recurring transaction, in days ('D') or calendar months ('M')
+RECURRING_STEPS = {
+    'Daily': ('D', 1),
+    'Weekly': ('D', 7),
+    'Monthly': ('M', 1),
+    'Yearly': ('M', 12),
+}
+
+
+def _occurrence_index(start, dates, unit, step):
+    """Index of the last occurrence on or before each date, counting from start as 0.
+
+    Monthly steps keep the start day and clip it to shorter months, so a schedule
+    starting on the 31st falls on the last day of February.
+    """
+    if unit == 'D':
+        elapsed = (dates - start).dt.days
+    else:
+        elapsed = (dates.dt.year - start.dt.year) * 12 + dates.dt.month - start.dt.month
+        due_day = np.minimum(start.dt.day, dates.dt.days_in_month)
+        elapsed = elapsed - (due_day > dates.dt.day)
+    return np.floor_divide(elapsed, step)
+
+
+def _recurring_occurrences(schedules, as_of):
+    """Expand schedules into a frame of (recurring_id, day) for every occurrence due by as_of"""
+    frames = []
+    for frequency, group in schedules.groupby('frequency'):
+        if frequency not in RECURRING_STEPS:
+            continue
+        unit, step = RECURRING_STEPS[frequency]
+        start = pd.to_datetime(group['start_date'], errors='coerce')
+        last = pd.to_datetime(group['last_generated'], errors='coerce')
+        until = pd.to_datetime(group['end_date'], errors='coerce').fillna(as_of).clip(upper=as_of)
+
+        first = (_occurrence_index(start, last, unit, step) + 1).fillna(0).clip(lower=0)
+        final = _occurrence_index(start, until, unit, step)
+        counts = (final - first + 1).fillna(0).clip(lower=0).astype(np.int64).to_numpy()
+        if not counts.any():
+            continue
+
+        # Occurrence numbers first, first + 1, ... laid out schedule by schedule
+        rows = np.repeat(np.arange(len(group)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        k = first.to_numpy(dtype=np.int64)[rows] + offsets
+        start = start.iloc[rows].reset_index(drop=True)
+        if unit == 'D':
+            dates = start + pd.to_timedelta(k * step, unit='D')
+        else:
+            months = start.dt.year * 12 + start.dt.month - 1 + k * step
+            firsts = pd.to_datetime(pd.DataFrame({'year': months // 12, 'month': months % 12 + 1, 'day': 1}))
+            dates = firsts + pd.to_timedelta(np.minimum(start.dt.day, firsts.dt.days_in_month) - 1, unit='D')
+        frames.append(pd.DataFrame({
+            'recurring_id': group['id'].to_numpy()[rows],
+            'day': _days_since_epoch(dates),
+        }))
+    if not frames:
+        return pd.DataFrame(columns=['recurring_id', 'day'])
+    return pd.concat(frames, ignore_index=True)
+
+# Connection pragmas, overridable per Database. journal_mode only applies to the writer.
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -16000,  # negative values are KiB, so 16 MB per connection
+    'mmap_size': 268435456,
+    'temp_store': 'MEMORY',
+    'busy_timeout': 5000,
+}
+
+
+# Most read connections open at once; queries beyond this wait for one to be returned
+DEFAULT_MAX_READERS = 4
+
+
+class ConnectionManager:
+    """A bounded pool of read connections and one serialized writer connection to a SQLite file.
+
+    In WAL mode readers never block the writer or each other, so each query
+    checks a reader out of the pool while writes queue on a lock. Streamlit
+    runs every rerun on a new thread, so readers are pooled rather than kept
+    per thread: their pragmas are set once and their page caches stay warm.
+    """
+
+    def __init__(self, db_path, pragmas=None, max_readers=DEFAULT_MAX_READERS):
+        self.db_path = db_path
+        self.pragmas = {**DEFAULT_PRAGMAS, **(pragmas or {})}
+        for name in self.pragmas:
+            if not name.isidentifier():
+                raise ValueError(f"Invalid pragma name: {name}")
+        self.generation = 0
+        self._trace = None
+        self._readers = []
+        self._idle_readers = []
+        self._readers_available = threading.BoundedSemaphore(max_readers)
+        self._pool_lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._write_depth = 0
+        self._writer = self._connect(writer=True)
+        # In-memory databases are private to a connection, so everything shares the writer
+        self._shared = db_path == ':memory:'
+        self._version_conn = self._writer if self._shared else self._connect(writer=False)
+        self._version_lock = threading.Lock()
+
+    def _connect(self, writer):
+        timeout = self.pragmas['busy_timeout'] / 1000
+        conn = sqlite3.connect(self.db_path, timeout=timeout, check_same_thread=False)
+        for name, value in self.pragmas.items():
+            if name == 'journal_mode' and not writer:
+                continue
+            conn.execute(f'PRAGMA {name} = {value}')
+        if not writer:
+            conn.execute('PRAGMA query_only = 1')
+        if self._trace:
+            conn.set_trace_callback(self._trace)
+        return conn
+
+    @contextmanager
+    def reader(self):
+        """Check a read-only connection out of the pool for the duration of the block"""
+        if self._shared:
+            yield self._writer
+            return
+        with self._readers_available:
+            with self._pool_lock:
+                conn = self._idle_readers.pop() if self._idle_readers else None
+            if conn is None:
+                conn = self._connect(writer=False)
+                with self._pool_lock:
+                    self._readers.append(conn)
+            try:
+                yield conn
+            finally:
+                with self._pool_lock:
+                    self._idle_readers.append(conn)
+
+    @contextmanager
+    def writer(self):
+        """Hold the write lock and yield the writer connection.
+
+        The outermost block runs in one explicit transaction, so savepoints and
+        DDL inside it are not committed early. It commits on success and rolls
+        back on error.
+        """
+        with self._write_lock:
+            self._write_depth += 1
+            try:
+                if self._write_depth == 1:
+                    self._writer.execute('BEGIN IMMEDIATE')
+                yield self._writer
+                if self._write_depth == 1:
+                    self._writer.commit()
+            except BaseException:
+                if self._write_depth == 1:
+                    self._writer.rollback()
+                raise
+            finally:
+                self._write_depth -= 1
+                if self._write_depth == 0:
+                    self.generation += 1
+
+    def set_trace_callback(self, callback):
+        """Pass every statement run on the writer and pooled readers, including later ones, to callback"""
+        with self._pool_lock:
+            self._trace = callback
+            for conn in [self._writer, *self._readers]:
+                conn.set_trace_callback(callback)
+
+    def data_version(self):
+        """Changes after every write through this manager and every commit by another process"""
+        with self._version_lock:
+            external = self._version_conn.execute('PRAGMA data_version').fetchone()[0]
+        return self.generation, external
+
+    def close(self):
+        with self._pool_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+            self._idle_readers.clear()
+        if not self._shared:
+            self._version_conn.close()
+        self._writer.close()
+
+
+class QueryCache:
+    """Size-bounded LRU cache of read results tagged with the data version they were read at"""
+
+    def __init__(self, maxsize=128, max_rows=50000):
+        self.maxsize = maxsize
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, _copy_result(entry[1])
+            self.misses += 1
+            return False, None
+
+    def put(self, key, version, value):
+        # Very large frames are not worth pinning in memory
+        if self.maxsize <= 0 or (hasattr(value, '__len__') and not isinstance(value, (dict, tuple))
+                                 and len(value) > self.max_rows):
+            return
+        with self._lock:
+            self._entries[key] = (version, _copy_result(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize
+            }
+
+
+class CategoryRegistry:
+    """Read-only snapshot of the default and custom categories, for forms and badges"""
+
+    def __init__(self, categories):
+        self.by_name = {}
+        for category in categories:
+            # A custom category can't shadow a default one of the same name
+            self.by_name.setdefault(category['name'], category)
+        self.names = list(self.by_name)
+        self.by_type = {'Income': [], 'Expense': []}
+        for category in self.by_name.values():
+            self.by_type.setdefault(category['type'], []).append(category)
+        self._frame = pd.DataFrame(list(self.by_name.values()), columns=CATEGORY_COLUMNS)
+
+    def names_of_type(self, type):
+        return [category['name'] for category in self.by_type.get(type, [])]
+
+    def icon(self, name):
+        category = self.by_name.get(name)
+        return (category['icon'] or '') if category else ''
+
+    def label(self, name):
+        """Icon and name, as shown in selectboxes"""
+        return f"{self.icon(name)} {name}".strip()
+
+    def frame(self):
+        return self._frame.copy()
+
+
+def _copy_result(value):
+    """Copy cached results so callers can modify what they get back"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    if isinstance(value, dict):
+        return copy.deepcopy(value)
+    return value
+
+
+@profile_methods
 class Database:
-    def __init__(self):
-        self.conn = sqlite3.connect('finance.db', check_same_thread=False)
+    def __init__(self, db_path='finance.db', cache_size=128, pragmas=None):
+        self.connections = ConnectionManager(db_path, pragmas)
+        self.cache = QueryCache(cache_size)
+        self._category_registry = None
         self.migrate_database()
 
+    def _reader(self):
+        return self.connections.reader()
+
+    def _writer(self):
+        return self.connections.writer()
+
+    def close(self):
+        self.connections.close()
+
+    def _cached(self, key, compute):
+        """Return compute() memoized under key until the data changes"""
+        version = self.connections.data_version()
+        hit, value = self.cache.get(key, version)
+        if hit:
+            return value
+        value = compute()
+        self.cache.put(key, version, value)
+        return value
+
+    @profiled
+    def _read_sql(self, query, params=(), decode=False):
+        """Cached pd.read_sql_query, optionally decoding (or, with 'compact', compacting) transactions"""
+        def compute():
+            with self._reader() as conn:
+                df = pd.read_sql_query(query, conn, params=list(params))
+            if decode == 'compact':
+                return _compact_transactions(df)
+            return _decode_transactions(df) if decode else df
+        return self._cached(('sql', query, tuple(params), decode), compute)
+
     def migrate_database(self):
-        # Get existing columns
-        cursor = self.conn.cursor()
-        cursor.execute("PRAGMA table_info(transactions)")
-        columns = [col[1] for col in cursor.fetchall()]
-
-        # Add tags column if it doesn't exist
-        if 'tags' not in columns:
-            self.conn.execute('ALTER TABLE transactions ADD COLUMN tags TEXT DEFAULT "[]"')
-            
-        # Create notification settings table if it doesn't exist
-        self.conn.execute('''
-        CREATE TABLE IF NOT EXISTS notification_settings (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER DEFAULT 1,
-            budget_alert_threshold INTEGER DEFAULT 80,
-            goal_deadline_alert_days INTEGER DEFAULT 7,
-            email_notifications BOOLEAN DEFAULT 0,
-            email_address TEXT,
-            active BOOLEAN DEFAULT 1
-        )''')
+        with self._writer() as conn:
+            # Everything below has already run on a database at the current version
+            if conn.execute('PRAGMA user_version').fetchone()[0] >= SCHEMA_VERSION:
+                return
+            cursor = conn.cursor()
+
+            # Create notification settings table if it doesn't exist
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS notification_settings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER DEFAULT 1,
+                budget_alert_threshold INTEGER DEFAULT 80,
+                goal_deadline_alert_days INTEGER DEFAULT 7,
+                email_notifications BOOLEAN DEFAULT 0,
+                email_address TEXT,
+                active BOOLEAN DEFAULT 1
+            )''')
         
-        # Insert default settings if table is empty
-        cursor.execute("SELECT COUNT(*) FROM notification_settings")
-        if cursor.fetchone()[0] == 0:
-            self.conn.execute('''
-            INSERT INTO notification_settings 
-            (budget_alert_threshold, goal_deadline_alert_days, email_notifications, active) 
-            VALUES (80, 7, 0, 1)
-            ''')
-            self.conn.commit()
+            # Insert default settings if table is empty
+            cursor.execute("SELECT COUNT(*) FROM notification_settings")
+            if cursor.fetchone()[0] == 0:
+                conn.execute('''
+                INSERT INTO notification_settings 
+                (budget_alert_threshold, goal_deadline_alert_days, email_notifications, active) 
+                VALUES (80, 7, 0, 1)
+                ''')
 
-        # Create tables if they don't exist
-        self.conn.execute('''
-        CREATE TABLE IF NOT EXISTS transactions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            date TEXT NOT NULL,
-            type TEXT NOT NULL,
-            category TEXT NOT NULL,
-            amount REAL NOT NULL,
-            description TEXT,
-            tags TEXT DEFAULT '[]',
-            recurring_id INTEGER,
-            FOREIGN KEY (recurring_id) REFERENCES recurring_transactions(id)
-        )''')
+            # Create tables if they don't exist
+            conn.execute(TRANSACTIONS_TABLE_SQL.format(name='transactions'))
+
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS recurring_transactions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                type TEXT NOT NULL,
+                category TEXT NOT NULL,
+                amount REAL NOT NULL,
+                description TEXT,
+                frequency TEXT NOT NULL,
+                start_date TEXT NOT NULL,
+                end_date TEXT,
+                last_generated TEXT,
+                tags TEXT DEFAULT '[]',
+                active BOOLEAN DEFAULT 1
+            )''')
+
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS custom_categories (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL UNIQUE,
+                type TEXT NOT NULL,
+                icon TEXT,
+                color TEXT,
+                description TEXT,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )''')
+
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS budget_goals (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                category TEXT NOT NULL,
+                amount REAL NOT NULL,
+                period TEXT NOT NULL
+            )''')
+
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS financial_goals (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                target_amount REAL NOT NULL,
+                current_amount REAL DEFAULT 0,
+                target_date TEXT NOT NULL,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                status TEXT DEFAULT 'active'
+            )''')
+
+            # Add columns introduced after the tables were first created
+            self._add_missing_columns(conn, 'transactions', {
+                'tags': "TEXT DEFAULT '[]'",
+                'recurring_id': 'INTEGER REFERENCES recurring_transactions(id)'
+            })
+            self._add_missing_columns(conn, 'custom_categories', {'description': 'TEXT'})
+            self._add_missing_columns(conn, 'financial_goals', {'status': "TEXT DEFAULT 'active'"})
+
+            # Older databases keep text dates and REAL amounts; convert them before
+            # anything below builds triggers or rollups on the stored columns
+            if 'day' not in {col[1] for col in conn.execute('PRAGMA table_info(transactions)')}:
+                self._convert_transaction_storage(conn)
+
+            # Apply versioned migrations
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            if version < 1:
+                # set_budget_goal relies on a unique (category, period) to replace goals
+                conn.execute('''
+                DELETE FROM budget_goals WHERE id NOT IN (
+                    SELECT MAX(id) FROM budget_goals GROUP BY category, period
+                )''')
+            if version < 2:
+                self._create_monthly_totals(conn)
+            if version < 3:
+                self._create_transaction_tags(conn)
+            if version < 4:
+                self._create_search_index(conn)
+            if version < 5:
+                # Recurring occurrences become unique per (recurring_id, day)
+                conn.execute('''
+                DELETE FROM transactions WHERE recurring_id IS NOT NULL AND id NOT IN (
+                    SELECT MIN(id) FROM transactions WHERE recurring_id IS NOT NULL
+                    GROUP BY recurring_id, day
+                )''')
+            if version < 6:
+                # The rollup now sums integer cents, and converting the transactions
+                # table dropped the triggers that keep the derived tables in sync
+                conn.execute('DROP TABLE IF EXISTS monthly_category_totals')
+                self._create_monthly_totals(conn)
+                self._create_tag_triggers(conn)
+                self._create_search_triggers(conn)
+                conn.execute(f'''
+                CREATE VIEW IF NOT EXISTS transactions_compat AS
+                SELECT {_select_columns(TRANSACTION_COLUMNS, DISPLAY_COLUMNS)} FROM transactions''')
+            if version < SCHEMA_VERSION:
+                self._sync_indexes(conn)
+                conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+    def _convert_transaction_storage(self, conn):
+        """Rebuild transactions with day and amount_cents columns, keeping ids and the id sequence.
+
+        Older versions stored dates as imported, so they are parsed in pandas.
+        Rows whose date can't be parsed are moved to transactions_unparsed.
+        """
+        sequence = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'transactions'").fetchone()
+        conn.execute('DROP VIEW IF EXISTS transactions_compat')
+        conn.execute('DROP TABLE IF EXISTS transactions_new')
+        conn.execute(TRANSACTIONS_TABLE_SQL.format(name='transactions_new'))
+
+        legacy = pd.read_sql_query('SELECT id, date FROM transactions', conn)
+        dates = _parse_legacy_dates(legacy['date'])
+        parsed = dates.notna()
+        conn.execute('CREATE TEMP TABLE legacy_days (id INTEGER PRIMARY KEY, day INTEGER NOT NULL)')
+        conn.executemany('INSERT INTO legacy_days (id, day) VALUES (?, ?)', zip(
+            legacy.loc[parsed, 'id'].tolist(), _days_since_epoch(dates[parsed]).tolist()
+        ))
+        conn.execute('''
+        INSERT INTO transactions_new (id, day, type, category, amount_cents, description, tags, recurring_id)
+        SELECT t.id, d.day, t.type, t.category, CAST(round(t.amount * 100) AS INTEGER), t.description, t.tags,
+               t.recurring_id
+        FROM transactions t JOIN legacy_days d ON d.id = t.id''')
+        if not parsed.all():
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS transactions_unparsed AS
+            SELECT * FROM transactions WHERE id NOT IN (SELECT id FROM legacy_days)''')
+            logger.warning("Moved %d transactions with unreadable dates to transactions_unparsed",
+                           int((~parsed).sum()))
+        conn.execute('DROP TABLE legacy_days')
+
+        conn.execute('DROP TABLE transactions')
+        conn.execute('ALTER TABLE transactions_new RENAME TO transactions')
+        if sequence is not None:
+            conn.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'transactions'",
+                         (sequence[0],))
 
-        self.conn.execute('''
-        CREATE TABLE IF NOT EXISTS recurring_transactions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
+    def _add_missing_columns(self, conn, table, columns):
+        existing = {col[1] for col in conn.execute(f'PRAGMA table_info({table})')}
+        for name, definition in columns.items():
+            if name not in existing:
+                conn.execute(f'ALTER TABLE {table} ADD COLUMN {name} {definition}')
+
+    def _sync_indexes(self, conn):
+        """Create the managed indexes and drop managed ones that are no longer listed"""
+        existing = {
+            name for (name,) in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx\\_%' ESCAPE '\\'"
+            )
+        }
+        for name in existing - set(INDEXES):
+            conn.execute(f'DROP INDEX {name}')
+        for name, statement in INDEXES.items():
+            if name not in existing:
+                conn.execute(statement)
+
+    def _create_monthly_totals(self, conn):
+        """Create the (month, type, category) rollup kept current by triggers"""
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS monthly_category_totals (
+            month TEXT NOT NULL,
             type TEXT NOT NULL,
             category TEXT NOT NULL,
-            amount REAL NOT NULL,
-            description TEXT,
-            frequency TEXT NOT NULL,
-            start_date TEXT NOT NULL,
-            end_date TEXT,
-            last_generated TEXT,
-            tags TEXT DEFAULT '[]',
-            active BOOLEAN DEFAULT 1
-        )''')
+            total_cents INTEGER NOT NULL DEFAULT 0,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (month, type, category)
+        ) WITHOUT ROWID''')
 
-        self.conn.execute('''
-        CREATE TABLE IF NOT EXISTS custom_categories (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL UNIQUE,
-            type TEXT NOT NULL,
-            icon TEXT,
-            color TEXT,
-            description TEXT,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )''')
+        self._create_rollup_triggers(conn)
+        self.rebuild_monthly_totals()
 
-        self.conn.execute('''
-        CREATE TABLE IF NOT EXISTS budget_goals (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            category TEXT NOT NULL,
-            amount REAL NOT NULL,
-            period TEXT NOT NULL
-        )''')
+    def _create_rollup_triggers(self, conn):
+        """Keep monthly_category_totals current as transactions change"""
+        month = "strftime('%Y-%m', {row}.day * 86400, 'unixepoch')"
+        new_month, old_month = month.format(row='new'), month.format(row='old')
+        # One statement at a time: executescript would commit the caller's transaction
+        for statement in (f'''
+        CREATE TRIGGER IF NOT EXISTS transactions_rollup_insert
+        AFTER INSERT ON transactions
+        BEGIN
+            INSERT INTO monthly_category_totals (month, type, category, total_cents, count)
+            VALUES ({new_month}, new.type, new.category, new.amount_cents, 1)
+            ON CONFLICT (month, type, category)
+            DO UPDATE SET total_cents = total_cents + excluded.total_cents, count = count + 1;
+        END
+        ''', f'''
+        CREATE TRIGGER IF NOT EXISTS transactions_rollup_delete
+        AFTER DELETE ON transactions
+        BEGIN
+            UPDATE monthly_category_totals
+            SET total_cents = total_cents - old.amount_cents, count = count - 1
+            WHERE month = {old_month} AND type = old.type AND category = old.category;
+            DELETE FROM monthly_category_totals
+            WHERE month = {old_month} AND type = old.type AND category = old.category
+              AND count <= 0;
+        END
+        ''', f'''
+        CREATE TRIGGER IF NOT EXISTS transactions_rollup_update
+        AFTER UPDATE OF day, type, category, amount_cents ON transactions
+        BEGIN
+            UPDATE monthly_category_totals
+            SET total_cents = total_cents - old.amount_cents, count = count - 1
+            WHERE month = {old_month} AND type = old.type AND category = old.category;
+            DELETE FROM monthly_category_totals
+            WHERE month = {old_month} AND type = old.type AND category = old.category
+              AND count <= 0;
+            INSERT INTO monthly_category_totals (month, type, category, total_cents, count)
+            VALUES ({new_month}, new.type, new.category, new.amount_cents, 1)
+            ON CONFLICT (month, type, category)
+            DO UPDATE SET total_cents = total_cents + excluded.total_cents, count = count + 1;
+        END
+        '''):
+            conn.execute(statement)
+
+    def _create_transaction_tags(self, conn):
+        """Create the normalized (transaction_id, tag) table, its sync triggers and back-fill it"""
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS transaction_tags (
+            transaction_id INTEGER NOT NULL REFERENCES transactions(id),
+            tag TEXT NOT NULL,
+            PRIMARY KEY (transaction_id, tag)
+        ) WITHOUT ROWID''')
+
+        self._create_tag_triggers(conn)
+
+        conn.execute('''
+        INSERT OR IGNORE INTO transaction_tags (transaction_id, tag)
+        SELECT transactions.id, trim(json_each.value)
+        FROM transactions, json_each(CASE WHEN json_valid(transactions.tags) THEN transactions.tags ELSE '[]' END)
+        WHERE trim(json_each.value) != ''
+        ''')
+
+    def _create_tag_triggers(self, conn):
+        """Keep transaction_tags in sync with the JSON tags of each transaction"""
+        for statement in ('''
+        CREATE TRIGGER IF NOT EXISTS transactions_tags_insert
+        AFTER INSERT ON transactions
+        BEGIN
+            INSERT OR IGNORE INTO transaction_tags (transaction_id, tag)
+            SELECT new.id, trim(value)
+            FROM json_each(CASE WHEN json_valid(new.tags) THEN new.tags ELSE '[]' END)
+            WHERE trim(value) != '';
+        END
+        ''', '''
+        CREATE TRIGGER IF NOT EXISTS transactions_tags_delete
+        AFTER DELETE ON transactions
+        BEGIN
+            DELETE FROM transaction_tags WHERE transaction_id = old.id;
+        END
+        ''', '''
+        CREATE TRIGGER IF NOT EXISTS transactions_tags_update
+        AFTER UPDATE OF tags ON transactions
+        BEGIN
+            DELETE FROM transaction_tags WHERE transaction_id = old.id;
+            INSERT OR IGNORE INTO transaction_tags (transaction_id, tag)
+            SELECT new.id, trim(value)
+            FROM json_each(CASE WHEN json_valid(new.tags) THEN new.tags ELSE '[]' END)
+            WHERE trim(value) != '';
+        END
+        '''):
+            conn.execute(statement)
 
-        self.conn.execute('''
-        CREATE TABLE IF NOT EXISTS financial_goals (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            target_amount REAL NOT NULL,
-            current_amount REAL DEFAULT 0,
-            target_date TEXT NOT NULL,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            status TEXT DEFAULT 'active'
+    def rebuild_monthly_totals(self):
+        """Recompute the monthly rollup from the raw transactions"""
+        with self._writer() as conn:
+            conn.execute('DELETE FROM monthly_category_totals')
+            conn.execute('''
+            INSERT INTO monthly_category_totals (month, type, category, total_cents, count)
+            SELECT strftime('%Y-%m', day * 86400, 'unixepoch') AS month, type, category,
+                   SUM(amount_cents), COUNT(*)
+            FROM transactions
+            GROUP BY month, type, category
+            ''')
+
+    def _create_search_index(self, conn):
+        """Create the FTS5 index over descriptions and tags, kept in sync by triggers"""
+        # Contentless table keyed by transaction id; tags are indexed as space-separated words
+        conn.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5(
+            description, tags, content='', tokenize='unicode61 remove_diacritics 2'
         )''')
 
-        self.conn.commit()
+        self._create_search_triggers(conn)
+
+        # Start from an empty index so re-running the back-fill can't add duplicate entries
+        conn.execute("INSERT INTO transactions_fts (transactions_fts) VALUES ('delete-all')")
+        conn.execute(f'''
+        INSERT INTO transactions_fts (rowid, description, tags)
+        SELECT id, description, {_fts_tags_sql('transactions')} FROM transactions
+        ''')
+
+    def _create_search_triggers(self, conn):
+        """Keep transactions_fts in sync with transaction descriptions and tags"""
+        for statement in (f'''
+        CREATE TRIGGER IF NOT EXISTS transactions_fts_insert
+        AFTER INSERT ON transactions
+        BEGIN
+            INSERT INTO transactions_fts (rowid, description, tags)
+            VALUES (new.id, new.description, {_fts_tags_sql('new')});
+        END
+        ''', f'''
+        CREATE TRIGGER IF NOT EXISTS transactions_fts_delete
+        AFTER DELETE ON transactions
+        BEGIN
+            INSERT INTO transactions_fts (transactions_fts, rowid, description, tags)
+            VALUES ('delete', old.id, old.description, {_fts_tags_sql('old')});
+        END
+        ''', f'''
+        CREATE TRIGGER IF NOT EXISTS transactions_fts_update
+        AFTER UPDATE OF description, tags ON transactions
+        BEGIN
+            INSERT INTO transactions_fts (transactions_fts, rowid, description, tags)
+            VALUES ('delete', old.id, old.description, {_fts_tags_sql('old')});
+            INSERT INTO transactions_fts (rowid, description, tags)
+            VALUES (new.id, new.description, {_fts_tags_sql('new')});
+        END
+        '''):
+            conn.execute(statement)
 
     def get_default_categories(self):
         return [
@@ -120,108 +922,476 @@ class Database:
         ]
 
     def add_custom_category(self, name, type, icon=None, color=None, description=None):
+        if any(category['name'] == name for category in self.get_default_categories()):
+            return False
         try:
-            self.conn.execute(
-                'INSERT INTO custom_categories (name, type, icon, color, description) VALUES (?, ?, ?, ?, ?)',
-                (name, type, icon, color, description)
-            )
-            self.conn.commit()
+            with self._writer() as conn:
+                conn.execute(
+                    'INSERT INTO custom_categories (name, type, icon, color, description) VALUES (?, ?, ?, ?, ?)',
+                    (name, type, icon, color, description)
+                )
+            self._category_registry = None
             return True
         except sqlite3.IntegrityError:
             return False
 
     def get_custom_categories(self):
-        return pd.read_sql_query('SELECT * FROM custom_categories', self.conn)
+        return self._read_sql('SELECT * FROM custom_categories')
 
-    def get_all_categories(self):
-        # Get default categories
-        default_categories = pd.DataFrame(self.get_default_categories())
-
-        # Get custom categories
-        custom_categories = self.get_custom_categories()
-        if not custom_categories.empty:
-            custom_categories = custom_categories[['name', 'type', 'icon', 'color']]
-            return pd.concat([default_categories, custom_categories], ignore_index=True)
+    def get_category_registry(self):
+        """Default and custom categories, rebuilt only after add_custom_category writes"""
+        registry = self._category_registry
+        if registry is None:
+            custom = self.get_custom_categories()
+            registry = self._category_registry = CategoryRegistry(
+                self.get_default_categories() + custom[list(CATEGORY_COLUMNS)].to_dict('records')
+            )
+        return registry
 
-        return default_categories
+    def get_all_categories(self):
+        return self.get_category_registry().frame()
 
     def add_transaction(self, date, type, category, amount, description, tags=None):
         tags_json = json.dumps(tags or [])
-        self.conn.execute(
-            'INSERT INTO transactions (date, type, category, amount, description, tags) VALUES (?, ?, ?, ?, ?, ?)',
-            (date, type, category, amount, description, tags_json)
-        )
-        self.conn.commit()
+        with self._writer() as conn:
+            conn.execute(
+                'INSERT INTO transactions (day, type, category, amount_cents, description, tags) VALUES (?, ?, ?, ?, ?, ?)',
+                (_day_key(date), type, category, int(_to_cents(amount)), description, tags_json)
+            )
+
+    def add_transactions(self, data, on_error='skip', batch_size=5000):
+        """Validate and insert many transactions in one transaction.
+
+        With on_error='skip' invalid rows are reported and left out; each batch
+        of valid rows runs under a savepoint so a failing batch can be retried
+        row by row, and everything commits together at the end. With
+        on_error='abort' nothing is inserted unless every row is valid.
+        Returns a report dict with the inserted count and per-row errors.
+        """
+        return self.add_transaction_chunks([data], on_error=on_error, batch_size=batch_size)
+
+    def add_transaction_chunks(self, chunks, on_error='skip', batch_size=5000, progress=None,
+                               max_errors=1000):
+        """Validate and insert an iterable of transaction DataFrames in one transaction.
+
+        Only one chunk is held at a time, so memory stays bounded by the chunk
+        size. Batches are only committed once every chunk has been read: if
+        reading a chunk raises, for example on a malformed CSV, the exception
+        propagates and nothing is imported. progress, if given, is called with
+        the running report after each chunk. At most max_errors rejected rows
+        are kept in the report; 'failed' counts all of them.
+        """
+        if on_error not in ('skip', 'abort'):
+            raise ValueError("on_error must be 'skip' or 'abort'")
+
+        report = {'total': 0, 'inserted': 0, 'failed': 0, 'errors': []}
+
+        def record_errors(errors):
+            report['failed'] += len(errors)
+            report['errors'].extend(errors[:max(max_errors - len(report['errors']), 0)])
+
+        insert = 'INSERT INTO transactions (day, type, category, amount_cents, description, tags) VALUES (?, ?, ?, ?, ?, ?)'
+        with self._writer() as conn:
+            for data in chunks:
+                rows, errors = _prepare_transactions(data)
+                report['total'] += len(data)
+                record_errors(errors)
+                if report['failed'] and on_error == 'abort':
+                    # Keep validating so the report covers the whole input
+                    if progress:
+                        progress(report)
+                    continue
+
+                records = list(rows.itertuples(index=False, name=None))
+                labels = rows.index.tolist()
+                for start in range(0, len(records), batch_size):
+                    batch = records[start:start + batch_size]
+                    if on_error == 'abort':
+                        conn.executemany(insert, batch)
+                        report['inserted'] += len(batch)
+                        continue
+
+                    conn.execute('SAVEPOINT import_batch')
+                    try:
+                        conn.executemany(insert, batch)
+                        conn.execute('RELEASE import_batch')
+                        report['inserted'] += len(batch)
+                    except sqlite3.DatabaseError:
+                        # Retry the failed batch row by row to pinpoint the bad rows
+                        conn.execute('ROLLBACK TO import_batch')
+                        conn.execute('RELEASE import_batch')
+                        for label, record in zip(labels[start:start + batch_size], batch):
+                            try:
+                                conn.execute(insert, record)
+                                report['inserted'] += 1
+                            except sqlite3.DatabaseError as e:
+                                record_errors([{'row': label, 'column': None, 'error': str(e)}])
+                if progress:
+                    progress(report)
+
+            if report['failed'] and on_error == 'abort':
+                conn.rollback()
+                report['inserted'] = 0
+        return report
 
     def add_recurring_transaction(self, name, type, category, amount, description, frequency, start_date, end_date=None, tags=None):
         tags_json = json.dumps(tags or [])
-        self.conn.execute(
-            '''INSERT INTO recurring_transactions 
-               (name, type, category, amount, description, frequency, start_date, end_date, tags)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-            (name, type, category, amount, description, frequency, start_date, end_date, tags_json)
-        )
-        self.conn.commit()
+        with self._writer() as conn:
+            conn.execute(
+                '''INSERT INTO recurring_transactions 
+                   (name, type, category, amount, description, frequency, start_date, end_date, tags)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                (name, type, category, amount, description, frequency, start_date, end_date, tags_json)
+            )
+
+    def generate_recurring_transactions(self, as_of=None):
+        """Insert every occurrence of the active schedules due by as_of (default today).
+
+        Safe to call repeatedly: each schedule resumes after its last_generated date
+        and the unique (recurring_id, day) index drops anything already inserted.
+        Returns the number of transactions added.
+        """
+        as_of = pd.Timestamp(as_of if as_of is not None else datetime.now()).normalize()
+        with self._writer() as conn:
+            schedules = pd.read_sql_query(
+                '''SELECT id, type, category, amount, description, frequency, start_date, end_date,
+                          last_generated, tags
+                   FROM recurring_transactions WHERE active = 1''',
+                conn
+            )
+            occurrences = _recurring_occurrences(schedules, as_of)
+            if occurrences.empty:
+                return 0
+
+            rows = occurrences.merge(schedules, left_on='recurring_id', right_on='id')
+            rows['tags'] = rows['tags'].fillna('[]')
+            rows['amount_cents'] = _to_cents(rows['amount'])
+            cursor = conn.executemany(
+                '''INSERT OR IGNORE INTO transactions
+                   (day, type, category, amount_cents, description, tags, recurring_id)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                rows[['day', 'type', 'category', 'amount_cents', 'description', 'tags', 'recurring_id']]
+                .itertuples(index=False, name=None)
+            )
+            latest = pd.to_datetime(occurrences.groupby('recurring_id')['day'].max(), unit='D')
+            conn.executemany(
+                'UPDATE recurring_transactions SET last_generated = ? WHERE id = ?',
+                [(date.strftime('%Y-%m-%d'), int(recurring_id)) for recurring_id, date in latest.items()]
+            )
+            return cursor.rowcount
 
     def get_recurring_transactions(self):
-        df = pd.read_sql_query('SELECT * FROM recurring_transactions WHERE active = 1', self.conn)
+        df = self._read_sql('SELECT * FROM recurring_transactions WHERE active = 1')
         if not df.empty:
             df['tags'] = df['tags'].apply(lambda x: json.loads(x) if x else [])
         return df
 
     def get_transactions(self):
-        df = pd.read_sql_query('SELECT * FROM transactions', self.conn)
-        if not df.empty:
-            # Convert tags from JSON string to list
-            df['tags'] = df['tags'].apply(lambda x: json.loads(x) if x else [])
-            # Ensure date is in datetime format
-            df['date'] = pd.to_datetime(df['date'])
-        return df
+        return self.query_transactions()
+
+    def _transaction_filters(self, start_date=None, end_date=None, types=None, categories=None,
+                             tags=None, search=None):
+        """Translate transaction filters into a parameterized WHERE clause"""
+        clauses = []
+        params = []
+        if start_date is not None:
+            clauses.append('day >= ?')
+            params.append(_day_key(start_date))
+        if end_date is not None:
+            # Dates are stored as whole days, so the end date is inclusive
+            clauses.append('day <= ?')
+            params.append(_day_key(end_date))
+        if types:
+            clauses.append(f"type IN ({', '.join('?' * len(types))})")
+            params.extend(types)
+        if categories:
+            clauses.append(f"category IN ({', '.join('?' * len(categories))})")
+            params.extend(categories)
+        if tags:
+            clauses.append(
+                f"transactions.id IN (SELECT transaction_id FROM transaction_tags "
+                f"WHERE tag IN ({', '.join('?' * len(tags))}))"
+            )
+            params.extend(tags)
+        match = _fts_query(search) if search else None
+        if match:
+            clauses.append('transactions.id IN (SELECT rowid FROM transactions_fts WHERE transactions_fts MATCH ?)')
+            params.append(match)
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        return where, params
+
+    def query_transactions(self, start_date=None, end_date=None, types=None, categories=None,
+                           tags=None, search=None, columns=None, order_by=None, ascending=True,
+                           limit=None, compact=False):
+        """Fetch only the transaction rows and columns matching the given filters.
+
+        With compact=True the frame uses categorical type/category, an integer
+        amount_cents column and Arrow-backed descriptions, and keeps the id in
+        place of tags so they can be loaded later with get_transaction_tags.
+        """
+        if columns:
+            unknown = set(columns) - set(TRANSACTION_COLUMNS)
+            if unknown:
+                raise ValueError(f"Unknown transaction columns: {', '.join(sorted(unknown))}")
+        else:
+            columns = TRANSACTION_COLUMNS
+        if compact and 'tags' in columns:
+            columns = ['id'] * ('id' not in columns) + [col for col in columns if col != 'tags']
+        select = _select_columns(columns, STORED_COLUMNS)
+
+        where, params = self._transaction_filters(start_date, end_date, types, categories, tags, search)
+        query = f'SELECT {select} FROM transactions{where}'
+
+        if order_by:
+            if order_by not in TRANSACTION_COLUMNS:
+                raise ValueError(f"Cannot order transactions by {order_by}")
+            sort = STORED_COLUMNS.get(order_by, order_by).format(prefix='')
+            query += f" ORDER BY {sort} {'ASC' if ascending else 'DESC'}"
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(int(limit))
+
+        return self._read_sql(query, params, decode='compact' if compact else True)
+
+    def page_transactions(self, page_size=50, after=None, before=None, columns=None, compact=False, **filters):
+        """Return one page of matching transactions, newest first, using keyset pagination on (date, id).
+
+        after and before are (date, id) keys of a row already shown: after moves to
+        older rows, before to newer ones, and the first page is returned when neither
+        is given or before runs out of newer rows. Accepts the same filters as
+        query_transactions and returns (page, has_previous, has_next).
+        """
+        columns = list(columns or TRANSACTION_COLUMNS)
+        unknown = set(columns) - set(TRANSACTION_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown transaction columns: {', '.join(sorted(unknown))}")
+        # The keys of the first and last rows are needed to fetch the neighbouring pages
+        for column in ('id', 'date'):
+            if column not in columns:
+                columns.insert(0, column)
+        if compact and 'tags' in columns:
+            columns.remove('tags')
+
+        where, params = self._transaction_filters(**filters)
+        clauses = [where.replace(' WHERE ', '', 1)] if where else []
+        if after is not None:
+            clauses.append('(day, id) < (?, ?)')
+            params += [_day_key(after[0]), int(after[1])]
+            order = 'DESC'
+        elif before is not None:
+            clauses.append('(day, id) > (?, ?)')
+            params += [_day_key(before[0]), int(before[1])]
+            order = 'ASC'
+        else:
+            order = 'DESC'
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+
+        # One extra row tells whether another page follows in this direction
+        query = (f'SELECT {_select_columns(columns, STORED_COLUMNS)} FROM transactions{where} '
+                 f'ORDER BY day {order}, id {order} LIMIT ?')
+        page = self._read_sql(query, params + [int(page_size) + 1], decode='compact' if compact else True)
+        more = len(page) > page_size
+        page = page.iloc[:page_size]
+
+        if before is not None:
+            if not more:
+                return self.page_transactions(page_size, columns=columns, compact=compact, **filters)
+            return page.iloc[::-1].reset_index(drop=True), True, True
+        return page.reset_index(drop=True), after is not None, more
+
+    def get_transaction_totals(self, by='type', **filters):
+        """Sum and count matching transactions per type, category or date, computed in SQLite.
+
+        Accepts the same filters as query_transactions.
+        """
+        if by not in ('type', 'category', 'date'):
+            raise ValueError(f"Cannot total transactions by {by}")
+        key = STORED_COLUMNS.get(by, by).format(prefix='')
+        where, params = self._transaction_filters(**filters)
+        query = (f'SELECT {key} AS {by}, SUM(amount_cents) AS amount_cents, COUNT(*) AS count '
+                 f'FROM transactions{where} GROUP BY {key} ORDER BY {key}')
+        totals = self._read_sql(query, params)
+        totals['amount'] = totals.pop('amount_cents').astype(np.int64) / 100
+        totals = totals[[by, 'amount', 'count']]
+        if by == 'date':
+            totals['date'] = pd.to_datetime(totals['date'].astype(np.int64), unit='D')
+        return totals
+
+    def get_transaction_tags(self, ids):
+        """Return the tag lists of the given transaction ids, as a Series in the same order"""
+        ids = [int(i) for i in ids]
+        with self._reader() as conn:
+            rows = conn.execute(
+                'SELECT id, tags FROM transactions WHERE id IN (SELECT value FROM json_each(?))',
+                (json.dumps(ids),)
+            ).fetchall()
+        tags = {id_: json.loads(value) if value else [] for id_, value in rows}
+        return pd.Series([tags.get(i, []) for i in ids], index=ids, dtype=object)
+
+    def iter_transactions(self, columns=TRANSACTION_COLUMNS, chunk_size=5000, **filters):
+        """Yield matching transaction rows in date order as lists of tuples, straight from a cursor.
+
+        Accepts the same filters as query_transactions, without building a DataFrame.
+        """
+        unknown = set(columns) - set(TRANSACTION_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown transaction columns: {', '.join(sorted(unknown))}")
+
+        where, params = self._transaction_filters(**filters)
+        # The reader stays checked out until the caller finishes or closes the generator
+        with self._reader() as conn:
+            cursor = conn.execute(
+                f"SELECT {_select_columns(columns, DISPLAY_COLUMNS)} FROM transactions{where} ORDER BY day, id",
+                params
+            )
+            try:
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    yield rows
+            finally:
+                cursor.close()
+
+    def search_transactions(self, text, columns=None, limit=50, **filters):
+        """Full-text search over descriptions and tags, best matches first.
+
+        Every word in text must match, and each word also matches as a prefix.
+        Accepts the same filters as query_transactions besides search.
+        """
+        match = _fts_query(text)
+        if not match:
+            return self.query_transactions(columns=columns, limit=0, **filters)
+
+        columns = columns or TRANSACTION_COLUMNS
+        unknown = set(columns) - set(TRANSACTION_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown transaction columns: {', '.join(sorted(unknown))}")
+
+        where, params = self._transaction_filters(**filters)
+        query = f'''
+        SELECT {_select_columns(columns, STORED_COLUMNS, 'transactions')}
+        FROM transactions_fts
+        JOIN transactions ON transactions.id = transactions_fts.rowid
+        WHERE transactions_fts MATCH ?{where.replace(' WHERE ', ' AND ', 1)}
+        ORDER BY transactions_fts.rank
+        LIMIT ?
+        '''
+        return self._read_sql(query, [match] + params + [int(limit)], decode=True)
+
+    def get_tag_counts(self, limit=None, **filters):
+        """Count how many matching transactions use each tag, most used first.
+
+        Accepts the same filters as query_transactions.
+        """
+        where, params = self._transaction_filters(**filters)
+        query = f'''
+        SELECT transaction_tags.tag AS tag, COUNT(*) AS count
+        FROM transaction_tags
+        JOIN transactions ON transactions.id = transaction_tags.transaction_id{where}
+        GROUP BY transaction_tags.tag
+        ORDER BY count DESC, tag
+        '''
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(int(limit))
+        return self._read_sql(query, params).set_index('tag')['count']
+
+    def get_transaction_date_range(self):
+        """Return the (first, last) transaction dates, or (None, None) when there are none"""
+        first, last = self._cached(('get_transaction_date_range',), self._compute_date_range)
+        if first is None:
+            return None, None
+        return pd.to_datetime(first, unit='D'), pd.to_datetime(last, unit='D')
+
+    def _compute_date_range(self):
+        with self._reader() as conn:
+            return conn.execute(
+                'SELECT (SELECT MIN(day) FROM transactions), (SELECT MAX(day) FROM transactions)'
+            ).fetchone()
 
     def set_budget_goal(self, category, amount, period):
-        self.conn.execute(
-            'INSERT OR REPLACE INTO budget_goals (category, amount, period) VALUES (?, ?, ?)',
-            (category, amount, period)
-        )
-        self.conn.commit()
+        with self._writer() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO budget_goals (category, amount, period) VALUES (?, ?, ?)',
+                (category, amount, period)
+            )
 
     def get_budget_goals(self):
-        return pd.read_sql_query('SELECT * FROM budget_goals', self.conn)
+        return self._read_sql('SELECT * FROM budget_goals')
 
     def add_financial_goal(self, name, target_amount, target_date):
-        self.conn.execute(
-            'INSERT INTO financial_goals (name, target_amount, target_date) VALUES (?, ?, ?)',
-            (name, target_amount, target_date)
-        )
-        self.conn.commit()
+        with self._writer() as conn:
+            conn.execute(
+                'INSERT INTO financial_goals (name, target_amount, target_date) VALUES (?, ?, ?)',
+                (name, target_amount, target_date)
+            )
 
     def update_financial_goal(self, goal_id, current_amount):
-        self.conn.execute(
-            'UPDATE financial_goals SET current_amount = ? WHERE id = ?',
-            (current_amount, goal_id)
-        )
-        self.conn.commit()
+        with self._writer() as conn:
+            conn.execute(
+                'UPDATE financial_goals SET current_amount = ? WHERE id = ?',
+                (current_amount, goal_id)
+            )
 
     def get_financial_goals(self):
-        return pd.read_sql_query('SELECT * FROM financial_goals', self.conn)
+        return self._read_sql('SELECT * FROM financial_goals')
         
     def get_notification_settings(self):
-        return pd.read_sql_query('SELECT * FROM notification_settings WHERE active = 1 LIMIT 1', self.conn)
+        return self._read_sql('SELECT * FROM notification_settings WHERE active = 1 LIMIT 1')
         
     def update_notification_settings(self, budget_threshold, goal_days, email_enabled, email_address=None):
-        self.conn.execute('''
-        UPDATE notification_settings 
-        SET budget_alert_threshold = ?, 
-            goal_deadline_alert_days = ?, 
-            email_notifications = ?,
-            email_address = ?
-        WHERE active = 1
-        ''', (budget_threshold, goal_days, 1 if email_enabled else 0, email_address))
-        self.conn.commit()
+        with self._writer() as conn:
+            conn.execute('''
+            UPDATE notification_settings 
+            SET budget_alert_threshold = ?, 
+                goal_deadline_alert_days = ?, 
+                email_notifications = ?,
+                email_address = ?
+            WHERE active = 1
+            ''', (budget_threshold, goal_days, 1 if email_enabled else 0, email_address))
+
+    def get_monthly_totals(self, start_month=None, end_month=None, types=None, categories=None):
+        """Read per month, type and category sums and counts from the rollup table"""
+        clauses = []
+        params = []
+        if start_month is not None:
+            clauses.append('month >= ?')
+            params.append(pd.Timestamp(start_month).strftime('%Y-%m'))
+        if end_month is not None:
+            clauses.append('month <= ?')
+            params.append(pd.Timestamp(end_month).strftime('%Y-%m'))
+        if types:
+            clauses.append(f"type IN ({', '.join('?' * len(types))})")
+            params.extend(types)
+        if categories:
+            clauses.append(f"category IN ({', '.join('?' * len(categories))})")
+            params.extend(categories)
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        return self._read_sql(
+            f'SELECT month, type, category, total_cents / 100.0 AS total, count '
+            f'FROM monthly_category_totals{where} ORDER BY month',
+            params
+        )
 
     def get_summary(self):
-        df = self.get_transactions()
-        if df.empty:
+        return self._cached(('get_summary',), self._compute_summary)
+
+    def _compute_summary(self):
+        with self._reader() as conn:
+            totals = conn.execute(
+                'SELECT type, category, SUM(total_cents) FROM monthly_category_totals GROUP BY type, category'
+            ).fetchall()
+            monthly = conn.execute(
+                """SELECT type, month, SUM(total_cents) / 100.0
+                   FROM monthly_category_totals
+                   WHERE type IN ('Income', 'Expense')
+                   GROUP BY type, month
+                   ORDER BY month"""
+            ).fetchall()
+        if not totals:
             return {
                 'total_income': 0,
                 'total_expenses': 0,
@@ -230,26 +1400,22 @@ class Database:
                 'monthly_trends': {}
             }
 
-        total_income = df[df['type'] == 'Income']['amount'].sum()
-        total_expenses = df[df['type'] == 'Expense']['amount'].sum()
+        # Sum exact cents and only convert to dollars at the end
+        income_cents = sum(cents for type_, _, cents in totals if type_ == 'Income')
+        expense_cents = sum(cents for type_, _, cents in totals if type_ == 'Expense')
 
         # Calculate expense categories
-        categories = df[df['type'] == 'Expense'].groupby('category')['amount'].sum().to_dict()
+        categories = {category: cents / 100 for type_, category, cents in totals if type_ == 'Expense'}
 
         # Calculate monthly trends
-        monthly_data = {}
-        for type_ in ['Income', 'Expense']:
-            type_data = df[df['type'] == type_].copy()
-            if not type_data.empty:
-                monthly = type_data.groupby(type_data['date'].dt.strftime('%Y-%m'))['amount'].sum()
-                monthly_data[type_] = monthly.to_dict()
-            else:
-                monthly_data[type_] = {}
+        monthly_data = {'Income': {}, 'Expense': {}}
+        for type_, month, amount in monthly:
+            monthly_data[type_][month] = amount
 
         return {
-            'total_income': total_income,
-            'total_expenses': total_expenses,
-            'net_worth': total_income - total_expenses,
+            'total_income': income_cents / 100,
+            'total_expenses': expense_cents / 100,
+            'net_worth': (income_cents - expense_cents) / 100,
             'categories': categories,
             'monthly_trends': monthly_data
-        }
\ No newline at end of file
+        }
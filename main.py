@@ -1,10 +1,18 @@
+import importlib
 import streamlit as st
-import pandas as pd
 from database import Database
-from components.dashboard import render_dashboard
-from components.transactions import render_transactions
-from components.budget import render_budget
-from components.reports import render_reports
+
+# Sidebar pages as (module, render function, takes the database). A page's
+# module, and the plotting libraries it uses, load the first time it is shown.
+PAGES = {
+    "Dashboard": ("components.dashboard", "render_dashboard", True),
+    "Transactions": ("components.transactions", "render_transactions", True),
+    "Budget": ("components.budget", "render_budget", True),
+    "Reports": ("components.reports", "render_reports", True),
+    "Settings": ("components.settings", "render_settings", True),
+    "Savings Calculator": ("components.savings_calculator", "render_savings_calculator", False),
+    "Data Operations": ("components.data_operations", "render_data_operations", True),
+}
 
 # Page configuration
 st.set_page_config(
@@ -18,6 +26,12 @@ st.set_page_config(
 with open('.streamlit/style.css') as f:
     st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
 
+# Sidebar navigation
+st.sidebar.title("Reality Tracker")
+st.sidebar.markdown("Welcome to your personal finance manager!")
+st.sidebar.subheader("Navigation")
+page = st.sidebar.radio("Go to", list(PAGES))
+
 # Initialize database
 @st.cache_resource
 def get_database():
@@ -25,87 +39,18 @@ def get_database():
 
 db = get_database()
 
-# Sidebar navigation
-st.sidebar.title("Reality Tracker")
-st.sidebar.markdown("Welcome to your personal finance manager!")
-st.sidebar.subheader("Navigation")
-page = st.sidebar.radio(
-    "Go to",
-    ["Dashboard", "Transactions", "Budget", "Reports", "Settings", "Savings Calculator", "Data Operations"]
-)
+# Catch up on recurring transactions once per session
+if 'recurring_generated' not in st.session_state:
+    db.generate_recurring_transactions()
+    st.session_state.recurring_generated = True
 
 # Main content
-if page == "Dashboard":
-    render_dashboard(db)
-elif page == "Transactions":
-    render_transactions(db)
-elif page == "Budget":
-    render_budget(db)
-elif page == "Reports":
-    render_reports(db)
-elif page == "Savings Calculator":
-    from components.savings_calculator import render_savings_calculator
-    render_savings_calculator()
-elif page == "Data Operations":
-    from components.data_operations import render_data_operations
-    render_data_operations(db)
+module, function, takes_db = PAGES[page]
+render = getattr(importlib.import_module(module), function)
+if takes_db:
+    render(db)
 else:
-    # Settings page
-    st.title("Settings")
-
-    # Notification Settings
-    st.header("Notification Settings")
-
-    # Get current settings
-    settings = db.get_notification_settings()
-
-    if not settings.empty:
-        settings = settings.iloc[0]
-
-        with st.form("notification_settings"):
-            st.subheader("Budget Alerts")
-            budget_threshold = st.slider(
-                "Alert threshold (% of budget)",
-                min_value=50,
-                max_value=100,
-                value=int(settings['budget_alert_threshold']),
-                step=5,
-                help="You'll be notified when your spending reaches this percentage of your budget"
-            )
-
-            st.subheader("Goal Deadline Alerts")
-            goal_days = st.number_input(
-                "Days before deadline",
-                min_value=1,
-                max_value=30,
-                value=int(settings['goal_deadline_alert_days']),
-                help="You'll be notified when a goal deadline is this many days away"
-            )
-
-            st.subheader("Email Notifications")
-            email_enabled = st.checkbox(
-                "Enable email notifications",
-                value=bool(settings['email_notifications']),
-                help="Send alerts to your email (not implemented yet)"
-            )
-
-            email_address = st.text_input(
-                "Email address",
-                value=settings['email_address'] if settings['email_address'] else "",
-                disabled=not email_enabled
-            )
-
-            if st.form_submit_button("Save Settings"):
-                try:
-                    db.update_notification_settings(
-                        budget_threshold,
-                        goal_days,
-                        email_enabled,
-                        email_address if email_enabled else None
-                    )
-                    st.success("Settings saved successfully!")
-                except Exception as e:
-                    st.error(f"Error saving settings: {str(e)}")
+    render()
 
 # Footer
 st.sidebar.markdown("---")
@@ -0,0 +1,17 @@
+import pytest
+
+from database import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Empty database in a temporary directory"""
+    db = Database(str(tmp_path / 'finance.db'))
+    yield db
+    db.close()
+
+
+def stored_rows(db, columns="date(day * 86400, 'unixepoch'), amount_cents"):
+    """Raw stored transaction rows in id order"""
+    with db.connections.reader() as conn:
+        return conn.execute(f'SELECT {columns} FROM transactions ORDER BY id').fetchall()
@@ -0,0 +1,103 @@
+import pandas as pd
+import pytest
+
+from conftest import stored_rows
+from database import _day_key, _days_since_epoch
+
+
+def transactions(dates, **columns):
+    """Import frame with one valid expense per date, overridable per column"""
+    data = {'date': dates, 'type': 'Expense', 'category': 'Food', 'amount': 12.5, 'description': 'lunch'}
+    return pd.DataFrame({**data, **columns}, index=range(len(dates)))
+
+
+def test_offset_dates_keep_their_wall_clock_day(db):
+    report = db.add_transactions(transactions(['2024-01-01T23:30:00-05:00', '2024-01-31T00:15:00-05:00']))
+
+    assert report['inserted'] == 2
+    assert [date for date, _ in stored_rows(db)] == ['2024-01-01', '2024-01-31']
+
+
+def test_day_keys_ignore_the_utc_offset():
+    dates = pd.Series(pd.to_datetime(['2024-01-01T23:30:00-05:00', '2024-03-01T00:30:00-05:00']))
+
+    assert _days_since_epoch(dates).tolist() == [_day_key('2024-01-01'), _day_key('2024-03-01')]
+    assert _day_key(pd.Timestamp('2024-01-01T23:30:00-05:00')) == _day_key('2024-01-01')
+
+
+@pytest.mark.parametrize('on_error', ['skip', 'abort'])
+@pytest.mark.parametrize('dates, expected', [
+    (['2024-01-01', '2024-01-02T10:00:00Z'], ['2024-01-01', '2024-01-02']),
+    (['2024-01-01T10:00:00+05:00', '2024-01-01T23:00:00-05:00'], ['2024-01-01', '2024-01-01']),
+    (['03/09/2025', '2025-03-10 08:00:00'], ['2025-03-09', '2025-03-10']),
+])
+def test_mixed_date_formats_import(db, on_error, dates, expected):
+    report = db.add_transactions(transactions(dates), on_error=on_error)
+
+    assert report['inserted'] == 2 and report['errors'] == []
+    assert [date for date, _ in stored_rows(db)] == expected
+
+
+def test_unparseable_dates_are_skipped_and_reported(db):
+    report = db.add_transactions(transactions(['2024-01-01T10:00:00Z', 'not a date', None, '2024-02-30',
+                                               '2024-01-05T10:00:00+05:00']))
+
+    assert report['inserted'] == 2 and report['failed'] == 3
+    assert report['errors'] == [{'row': row, 'column': 'date', 'error': 'Invalid or missing date'}
+                                for row in (1, 2, 3)]
+    assert [date for date, _ in stored_rows(db)] == ['2024-01-01', '2024-01-05']
+
+
+def test_unparseable_dates_abort_the_whole_import(db):
+    report = db.add_transactions(transactions(['2024-01-01', 'not a date', '2024-01-05T10:00:00+05:00']),
+                                 on_error='abort')
+
+    assert report['inserted'] == 0 and report['failed'] == 1
+    assert report['errors'] == [{'row': 1, 'column': 'date', 'error': 'Invalid or missing date'}]
+    assert stored_rows(db) == []
+
+
+@pytest.mark.parametrize('on_error', ['skip', 'abort'])
+def test_missing_required_column_is_rejected(db, on_error):
+    with pytest.raises(ValueError, match='Missing required columns: amount'):
+        db.add_transactions(transactions(['2024-01-01']).drop(columns='amount'), on_error=on_error)
+    assert stored_rows(db) == []
+
+
+INVALID_ROWS = [
+    ({'amount': ['12.5', 'twelve']}, {'row': 1, 'column': 'amount', 'error': 'Amount must be a number'}),
+    ({'type': ['Expense', 'Refund']}, {'row': 1, 'column': 'type', 'error': "Type must be 'Income' or 'Expense'"}),
+    ({'category': ['Food', ' ']}, {'row': 1, 'column': 'category', 'error': 'Missing category'}),
+]
+
+
+@pytest.mark.parametrize('columns, error', INVALID_ROWS)
+def test_invalid_rows_are_skipped_and_reported(db, columns, error):
+    report = db.add_transactions(transactions(['2024-01-01', '2024-01-02'], **columns), on_error='skip')
+
+    assert report == {'total': 2, 'inserted': 1, 'failed': 1, 'errors': [error]}
+    assert stored_rows(db) == [('2024-01-01', 1250)]
+
+
+@pytest.mark.parametrize('columns, error', INVALID_ROWS)
+def test_invalid_rows_abort_the_whole_import(db, columns, error):
+    report = db.add_transactions(transactions(['2024-01-01', '2024-01-02'], **columns), on_error='abort')
+
+    assert report == {'total': 2, 'inserted': 0, 'failed': 1, 'errors': [error]}
+    assert stored_rows(db) == []
+
+
+@pytest.mark.parametrize('on_error', ['skip', 'abort'])
+def test_unknown_categories_are_imported_as_given(db, on_error):
+    # Files from other tools carry their own categories; only blank ones are rejected
+    report = db.add_transactions(transactions(['2024-01-01'], category=['Pet Supplies'], type=['expense']),
+                                 on_error=on_error)
+
+    assert report['inserted'] == 1 and report['errors'] == []
+    assert stored_rows(db, 'type, category') == [('Expense', 'Pet Supplies')]
+
+
+def test_report_keeps_at_most_max_errors(db):
+    report = db.add_transaction_chunks([transactions(['bad'] * 5)], max_errors=2)
+
+    assert report['failed'] == 5 and len(report['errors']) == 2
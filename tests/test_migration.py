@@ -0,0 +1,109 @@
+import sqlite3
+
+import pytest
+
+from database import SCHEMA_VERSION, Database
+
+# Transactions as the original release stored them: text dates as imported and REAL amounts
+BASELINE_SCHEMA = '''
+CREATE TABLE transactions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL,
+    type TEXT NOT NULL,
+    category TEXT NOT NULL,
+    amount REAL NOT NULL,
+    description TEXT,
+    tags TEXT DEFAULT '[]',
+    recurring_id INTEGER
+);
+'''
+
+BASELINE_ROWS = [
+    (1, '2025-01-05', 'Expense', 'Food', 10.1, 'coffee beans', '["cafe"]'),
+    (2, '03/09/2025', 'Expense', 'Food', 0.29, 'bagel', '[]'),
+    (4, '2025-01-20 13:45:00', 'Income', 'Salary', 2500.0, 'january pay', '["work", "monthly"]'),
+    (5, 'not a date', 'Expense', 'Other', 99.99, 'mystery', '[]'),
+    (6, '2025-03-31T23:30:00', 'Expense', 'Transport', 12.345, 'late taxi', '["travel"]'),
+]
+
+
+@pytest.fixture
+def baseline_path(tmp_path):
+    path = str(tmp_path / 'finance.db')
+    conn = sqlite3.connect(path)
+    conn.executescript(BASELINE_SCHEMA)
+    conn.executemany('INSERT INTO transactions (id, date, type, category, amount, description, tags) '
+                     'VALUES (?, ?, ?, ?, ?, ?, ?)', BASELINE_ROWS)
+    # A deleted row leaves the id sequence ahead of the highest id
+    conn.execute("UPDATE sqlite_sequence SET seq = 9 WHERE name = 'transactions'")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def query(db, sql, params=()):
+    with db.connections.reader() as conn:
+        return conn.execute(sql, params).fetchall()
+
+
+def dump(path):
+    conn = sqlite3.connect(path)
+    try:
+        return list(conn.iterdump()), conn.execute('PRAGMA user_version').fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_baseline_database_is_converted(baseline_path):
+    db = Database(baseline_path)
+    try:
+        assert query(db, "SELECT id, date(day * 86400, 'unixepoch'), amount_cents FROM transactions ORDER BY id") == [
+            (1, '2025-01-05', 1010),
+            (2, '2025-03-09', 29),
+            (4, '2025-01-20', 250000),
+            (6, '2025-03-31', 1235),
+        ]
+        assert query(db, 'SELECT id, date, amount FROM transactions_unparsed') == [(5, 'not a date', 99.99)]
+
+        assert query(db, 'SELECT month, type, category, total_cents, count FROM monthly_category_totals '
+                         'ORDER BY month, type, category') == [
+            ('2025-01', 'Expense', 'Food', 1010, 1),
+            ('2025-01', 'Income', 'Salary', 250000, 1),
+            ('2025-03', 'Expense', 'Food', 29, 1),
+            ('2025-03', 'Expense', 'Transport', 1235, 1),
+        ]
+        assert query(db, 'SELECT transaction_id, tag FROM transaction_tags ORDER BY 1, 2') == [
+            (1, 'cafe'), (4, 'monthly'), (4, 'work'), (6, 'travel'),
+        ]
+        assert db.search_transactions('coffee')['id'].tolist() == [1]
+        assert db.search_transactions('work')['id'].tolist() == [4]
+        assert query(db, "SELECT rowid FROM transactions_fts WHERE transactions_fts MATCH 'mystery'") == []
+
+        # New rows continue after the old sequence instead of reusing deleted ids
+        db.add_transaction('2025-04-01', 'Expense', 'Food', 1.0, 'new')
+        assert query(db, 'SELECT MAX(id) FROM transactions') == [(10,)]
+        assert query(db, 'PRAGMA user_version') == [(SCHEMA_VERSION,)]
+    finally:
+        db.close()
+
+
+def test_second_run_is_a_no_op(baseline_path):
+    Database(baseline_path).close()
+    migrated = dump(baseline_path)
+
+    db = Database(baseline_path)
+    db.migrate_database()
+    db.close()
+    assert dump(baseline_path) == migrated
+
+
+def test_failed_migration_leaves_the_database_untouched(baseline_path, monkeypatch):
+    before = dump(baseline_path)
+
+    def fail(self, conn):
+        raise RuntimeError('interrupted')
+
+    monkeypatch.setattr(Database, '_create_search_index', fail)
+    with pytest.raises(RuntimeError, match='interrupted'):
+        Database(baseline_path)
+    assert dump(baseline_path) == before
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from components import monte_carlo
+from components.finance_math import balance_timeline, periodic_rate
+from components.monte_carlo import simulate_savings
+from components.savings_calculator import calculate_monthly_savings
+
+
+@pytest.mark.parametrize('when', ['end', 'begin'])
+@pytest.mark.parametrize('compounding', [12, 4, 365])
+def test_zero_volatility_follows_the_fixed_rate_plan(when, compounding):
+    contribution = calculate_monthly_savings(50000, 10000, 60, 5.0, compounding, when)
+    result = simulate_savings(50000, 10000, contribution, 60, mean_return=0.05, volatility=0.0, inflation=0.0,
+                              when=when, paths=100, seed=1, compounding=compounding)
+
+    plan = balance_timeline(periodic_rate(0.05, 12, compounding), 60, 10000, contribution, when)
+    for column in ('P10', 'P50', 'P90'):
+        np.testing.assert_allclose(result['bands'][column], plan[result['bands'].index], rtol=1e-9)
+    assert result['final']['P50'] == pytest.approx(50000)
+    assert result['probability'] == 1.0
+    assert result['probability_any'] == 1.0
+
+
+def test_inflation_only_changes_the_real_balances():
+    args = dict(volatility=0.1, paths=2000, seed=7, mean_return=0.05)
+    nominal = simulate_savings(50000, 10000, 600, 60, inflation=0.0, **args)
+    inflated = simulate_savings(50000, 10000, 600, 60, inflation=0.02, **args)
+
+    assert inflated['bands'].equals(nominal['bands'])
+    assert inflated['probability'] == nominal['probability']
+    assert inflated['final_real']['P50'] == pytest.approx(nominal['final']['P50'] / 1.02 ** 5)
+
+
+def test_seeded_runs_match_across_the_process_pool(monkeypatch):
+    monkeypatch.setattr(monte_carlo, 'PARALLEL_MIN_PATH_MONTHS', 0)
+    args = (50000, 10000, 600, 60)
+    serial = simulate_savings(*args, paths=12000, seed=3, workers=1)
+    pooled = simulate_savings(*args, paths=12000, seed=3, workers=2)
+
+    assert pooled['parallel'] and not serial['parallel']
+    assert pooled['bands'].equals(serial['bands'])
+    assert pooled['probability'] == serial['probability']
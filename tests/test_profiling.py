@@ -0,0 +1,83 @@
+import time
+
+import pandas as pd
+import pytest
+
+from components import profiling
+from components.profiling import PROFILER, profiled
+
+
+@pytest.fixture
+def profiler(monkeypatch):
+    monkeypatch.setattr(PROFILER, 'enabled', True)
+    PROFILER.reset()
+    yield PROFILER
+    PROFILER.reset()
+
+
+@pytest.fixture
+def slow_measurement(monkeypatch):
+    """Make every result-size measurement take 50 ms"""
+    result_size = profiling._result_size
+
+    def slow(result):
+        time.sleep(0.05)
+        return result_size(result)
+
+    monkeypatch.setattr(profiling, '_result_size', slow)
+
+
+@profiled
+def read_frame():
+    return pd.DataFrame({'amount': range(100)})
+
+
+@profiled
+def query():
+    return read_frame()
+
+
+@profiled
+def get_all():
+    return query()
+
+
+@profiled
+def summarize():
+    return get_all().describe()
+
+
+def stats(profiler):
+    return profiler.report().set_index('name')
+
+
+def test_passed_through_results_are_counted_once(profiler):
+    get_all()
+    report = stats(profiler)
+
+    assert report.loc['read_frame', 'rows'] == 100 and report.loc['read_frame', 'bytes'] > 0
+    assert report.loc[['query', 'get_all'], ['rows', 'bytes']].eq(0).all().all()
+
+
+def test_measuring_results_is_not_own_time(profiler, slow_measurement):
+    summarize()
+    report = stats(profiler)
+
+    # Two frames are measured, 100 ms in all, none of it inside any call's own time
+    assert report['own_ms'].max() < 40
+    assert report.loc['summarize', 'rows'] == 8
+
+
+def test_generator_items_are_counted_once(profiler):
+    @profiled
+    def chunks():
+        yield from ([(i,)] * 10 for i in range(3))
+
+    @profiled
+    def export():
+        yield from chunks()
+
+    assert len(list(export())) == 3
+    report = stats(profiler)
+    assert report.loc['test_generator_items_are_counted_once.<locals>.chunks', 'rows'] == 30
+    assert report.loc['test_generator_items_are_counted_once.<locals>.export', 'rows'] == 0
@@ -0,0 +1,64 @@
+"""Every SELECT the app sends to SQLite must use an index on the large tables."""
+import os
+import shutil
+
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.pages import PAGES, ROOT
+from benchmarks.query_plans import check_query_plans, full_scans, seed
+from database import ConnectionManager, Database
+
+
+@pytest.fixture
+def app_dir(tmp_path, monkeypatch):
+    """Working directory holding the app's config and a small seeded finance.db"""
+    shutil.copytree(os.path.join(ROOT, '.streamlit'), tmp_path / '.streamlit')
+    db = Database(str(tmp_path / 'finance.db'))
+    seed(db)
+    db.close()
+    monkeypatch.chdir(tmp_path)
+    st.cache_resource.clear()
+    yield tmp_path
+    st.cache_resource.clear()
+
+
+@pytest.fixture
+def traced_statements(monkeypatch):
+    """SQL run on every connection the app opens from here on"""
+    statements = []
+    connect = ConnectionManager._connect
+
+    def traced_connect(self, writer):
+        conn = connect(self, writer)
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr(ConnectionManager, '_connect', traced_connect)
+    return statements
+
+
+def test_database_reads_use_indexes():
+    failures = check_query_plans()
+    assert not failures, failures
+
+
+@pytest.mark.parametrize('page', PAGES)
+def test_page_queries_use_indexes(page, app_dir, traced_statements):
+    at = AppTest.from_file(os.path.join(ROOT, 'main.py'), default_timeout=60)
+    at.run()
+    if page != PAGES[0]:
+        # Only keep what rendering this page runs, not the Dashboard shown first
+        traced_statements.clear()
+        at.sidebar.radio[0].set_value(page).run()
+    assert not at.exception
+
+    selects = [statement for statement in traced_statements if statement.lstrip().upper().startswith('SELECT')]
+    db = Database(str(app_dir / 'finance.db'))
+    try:
+        with db.connections.reader() as conn:
+            scans = {statement: full_scans(conn, statement) for statement in selects}
+    finally:
+        db.close()
+    assert not {statement: tables for statement, tables in scans.items() if tables}
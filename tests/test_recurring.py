@@ -0,0 +1,105 @@
+import pandas as pd
+import pytest
+
+from database import RECURRING_STEPS
+
+
+def occurrence_dates(db, recurring_id=None):
+    """Stored dates of generated occurrences, oldest first"""
+    with db.connections.reader() as conn:
+        rows = conn.execute(
+            "SELECT date(day * 86400, 'unixepoch') FROM transactions "
+            "WHERE recurring_id = coalesce(?, recurring_id) ORDER BY day",
+            (recurring_id,)
+        ).fetchall()
+    return [date for (date,) in rows]
+
+
+def schedule(db, frequency, start_date, end_date=None):
+    db.add_recurring_transaction('Rent', 'Expense', 'Housing', 1200.0, 'rent', frequency, start_date, end_date)
+    return int(db.get_recurring_transactions()['id'].max())
+
+
+def reference_dates(frequency, start_date, until):
+    """Occurrences from a plain loop: fixed days, or calendar months clipped to shorter months"""
+    unit, step = RECURRING_STEPS[frequency]
+    start, until = pd.Timestamp(start_date), pd.Timestamp(until)
+    dates = []
+    k = 0
+    while True:
+        date = start + (pd.Timedelta(days=k * step) if unit == 'D' else pd.DateOffset(months=k * step))
+        if date > until:
+            return dates
+        dates.append(date.strftime('%Y-%m-%d'))
+        k += 1
+
+
+@pytest.mark.parametrize('frequency, start_date, as_of, expected', [
+    ('Daily', '2024-01-30', '2024-02-02', ['2024-01-30', '2024-01-31', '2024-02-01', '2024-02-02']),
+    ('Weekly', '2024-02-26', '2024-03-12', ['2024-02-26', '2024-03-04', '2024-03-11']),
+    ('Monthly', '2024-01-31', '2024-05-31', ['2024-01-31', '2024-02-29', '2024-03-31', '2024-04-30', '2024-05-31']),
+    ('Yearly', '2024-02-29', '2028-03-01', ['2024-02-29', '2025-02-28', '2026-02-28', '2027-02-28', '2028-02-29']),
+])
+def test_schedules_generate_every_occurrence(db, frequency, start_date, as_of, expected):
+    recurring_id = schedule(db, frequency, start_date)
+
+    assert db.generate_recurring_transactions(as_of=as_of) == len(expected)
+    assert occurrence_dates(db, recurring_id) == expected
+
+
+@pytest.mark.parametrize('frequency', list(RECURRING_STEPS))
+@pytest.mark.parametrize('start_date', ['2023-01-31', '2023-08-30', '2024-02-29', '2024-12-31'])
+def test_schedules_match_a_plain_loop(db, frequency, start_date):
+    recurring_id = schedule(db, frequency, start_date)
+    db.generate_recurring_transactions(as_of='2027-03-15')
+
+    assert occurrence_dates(db, recurring_id) == reference_dates(frequency, start_date, '2027-03-15')
+
+
+@pytest.mark.parametrize('frequency, expected', [
+    ('Daily', ['2024-03-14', '2024-03-15']),
+    ('Weekly', ['2024-03-01', '2024-03-08', '2024-03-15']),
+    ('Monthly', ['2024-01-15', '2024-02-15', '2024-03-15']),
+])
+def test_end_date_is_inclusive(db, frequency, expected):
+    start_date = {'Daily': '2024-03-14', 'Weekly': '2024-03-01', 'Monthly': '2024-01-15'}[frequency]
+    recurring_id = schedule(db, frequency, start_date, end_date='2024-03-15')
+
+    db.generate_recurring_transactions(as_of='2024-06-01')
+    assert occurrence_dates(db, recurring_id) == expected
+
+
+def test_nothing_is_due_before_the_start_date(db):
+    schedule(db, 'Monthly', '2024-05-01')
+
+    assert db.generate_recurring_transactions(as_of='2024-04-30') == 0
+    assert occurrence_dates(db) == []
+
+
+@pytest.mark.parametrize('frequency', list(RECURRING_STEPS))
+def test_second_run_inserts_nothing(db, frequency):
+    recurring_id = schedule(db, frequency, '2024-01-31')
+    first = db.generate_recurring_transactions(as_of='2025-03-01')
+
+    assert first > 0
+    assert db.generate_recurring_transactions(as_of='2025-03-01') == 0
+    assert len(occurrence_dates(db, recurring_id)) == first
+
+
+def test_later_runs_resume_after_last_generated(db):
+    recurring_id = schedule(db, 'Monthly', '2024-01-31')
+
+    assert db.generate_recurring_transactions(as_of='2024-03-15') == 2
+    assert db.get_recurring_transactions()['last_generated'].tolist() == ['2024-02-29']
+    assert db.generate_recurring_transactions(as_of='2024-05-01') == 2
+    assert occurrence_dates(db, recurring_id) == ['2024-01-31', '2024-02-29', '2024-03-31', '2024-04-30']
+
+
+def test_unique_index_drops_occurrences_already_inserted(db):
+    recurring_id = schedule(db, 'Weekly', '2024-01-01')
+    db.generate_recurring_transactions(as_of='2024-01-29')
+    with db._writer() as conn:
+        conn.execute('UPDATE recurring_transactions SET last_generated = NULL')
+
+    assert db.generate_recurring_transactions(as_of='2024-01-29') == 0
+    assert len(occurrence_dates(db, recurring_id)) == 5